@@ -0,0 +1,126 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from rocials_backend import generations
+
+
+class LocalUserCache:
+    """Bounded, thread-safe LRU of user objects whose entries expire after ``ttl`` seconds"""
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            user, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return user
+
+    def set(self, key, user):
+        with self._lock:
+            self._entries[key] = (user, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def discard_user(self, user_id):
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == str(user_id)]:
+                del self._entries[key]
+
+
+local_users = LocalUserCache(settings.AUTH_USER_CACHE_SIZE, settings.AUTH_USER_CACHE_TTL)
+
+
+# Backends private to each process: a generation bump there never reaches
+# the other workers, so the shared tier is skipped
+PER_PROCESS_CACHES = {
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+}
+
+
+def shared_cache_enabled():
+    return settings.CACHES['default']['BACKEND'] not in PER_PROCESS_CACHES
+
+
+def _shared_fields():
+    # The password hash never leaves the process; it stays deferred on
+    # users rebuilt from the shared cache
+    return [field.attname for field in get_user_model()._meta.concrete_fields if field.attname != 'password']
+
+
+def _generation_key(user_id):
+    return f'auth:gen:{user_id}'
+
+
+def invalidate_user(user_id):
+    """Drop cached copies of a user after their row changed"""
+    generations.bump(_generation_key(user_id))
+    local_users.discard_user(user_id)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that resolves the token's user from cache.
+
+    Users are cached per (user ID, token ``iat``) in a short-lived
+    in-process LRU. When the Django cache is shared between workers, it
+    backs the LRU with the user's field values (minus the password hash),
+    versioned by a per-user generation that invalidate_user() bumps. Either
+    way a profile update, password change or deactivation is seen by every
+    worker within AUTH_USER_CACHE_TTL seconds.
+    """
+
+    def get_user(self, validated_token):
+        return self.get_cached_user(validated_token, validated_token.get('iat'))
+
+    def get_cached_user(self, validated_token, iat):
+        """The token's user, cached under ``iat`` (refreshes rotate, so they pass None)"""
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken('Token contained no recognizable user identification')
+
+        # Token claims may carry the ID as a string
+        local_key = (str(user_id), iat)
+        user = local_users.get(local_key)
+        if user is None:
+            if shared_cache_enabled():
+                user = self.get_shared_user(validated_token, user_id, iat)
+            else:
+                user = super().get_user(validated_token)
+            local_users.set(local_key, user)
+        # Each request gets its own instance, so views can't mutate the cached one
+        return copy.copy(user)
+
+    def get_shared_user(self, validated_token, user_id, iat):
+        [generation] = generations.current(_generation_key(user_id))
+        shared_key = f'auth:user:{user_id}:{generation}:{iat}'
+        fields = _shared_fields()
+        values = cache.get(shared_key)
+        if values is not None:
+            return get_user_model().from_db(DEFAULT_DB_ALIAS, fields, values)
+        # Loads the row and rejects inactive users
+        user = super().get_user(validated_token)
+        cache.set(shared_key, tuple(getattr(user, field) for field in fields), settings.AUTH_USER_SHARED_CACHE_TTL)
+        return user
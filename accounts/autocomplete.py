@@ -0,0 +1,168 @@
+import heapq
+import threading
+import time
+from bisect import bisect_left, insort
+
+from django.conf import settings
+from django.db import connection
+
+from .models import User
+
+SEPARATOR = '\x00'
+
+
+def _keys(username, display_name):
+    keys = {username.lower()}
+    if display_name:
+        keys.add(display_name.lower())
+        # Also match on the last name alone ("smi" -> "John Smith")
+        keys.add(display_name.lower().rsplit(' ', 1)[-1])
+    return keys
+
+
+class AutocompleteIndex:
+    """
+    In-process prefix index of usernames and display names.
+
+    Keys are kept in one sorted list of ``"<key>\\0<user_id>"`` strings, so
+    a prefix maps to a contiguous slice found with two bisections. Results
+    are ranked by follower count. Answers come from memory and never touch
+    the database once the index is loaded.
+    """
+
+    def __init__(self):
+        self._entries = []
+        self._users = {}
+        self._top_cache = {}
+        self._lock = threading.RLock()
+        # Updates made while load() reads the database, replayed on the new data
+        self._changes = None
+        self.loaded_at = None
+
+    def __len__(self):
+        return len(self._users)
+
+    def __contains__(self, user_id):
+        return user_id in self._users
+
+    def add(self, user_id, username, first_name='', last_name='', followers_count=0):
+        display_name = f'{first_name} {last_name}'.strip()
+        with self._lock:
+            self.remove(user_id)
+            self._users[user_id] = (username, display_name, followers_count)
+            for key in _keys(username, display_name):
+                insort(self._entries, f'{key}{SEPARATOR}{user_id}')
+            self._top_cache.clear()
+            if self._changes is not None:
+                self._changes.append((self.add, (user_id, username, first_name, last_name, followers_count)))
+
+    def remove(self, user_id):
+        with self._lock:
+            if self._changes is not None:
+                self._changes.append((self.remove, (user_id,)))
+            user = self._users.pop(user_id, None)
+            if user is None:
+                return
+            for key in _keys(user[0], user[1]):
+                entry = f'{key}{SEPARATOR}{user_id}'
+                position = bisect_left(self._entries, entry)
+                if position < len(self._entries) and self._entries[position] == entry:
+                    del self._entries[position]
+            self._top_cache.clear()
+
+    def load(self, users):
+        """
+        Replace the index with ``(id, username, first, last, followers)`` rows.
+
+        The old data keeps serving searches while the rows are read; updates
+        made meanwhile are replayed once the new data is swapped in.
+        """
+        with self._lock:
+            self._changes = []
+        try:
+            entries, index = [], {}
+            for user_id, username, first_name, last_name, followers_count in users:
+                display_name = f'{first_name} {last_name}'.strip()
+                index[user_id] = (username, display_name, followers_count)
+                entries += [f'{key}{SEPARATOR}{user_id}' for key in _keys(username, display_name)]
+            entries.sort()
+            with self._lock:
+                changes, self._changes = self._changes, None
+                self._entries, self._users = entries, index
+                for apply, args in changes:
+                    apply(*args)
+                self._top_cache.clear()
+                self.loaded_at = time.monotonic()
+        finally:
+            self._changes = None
+
+    def search(self, prefix, limit=10):
+        prefix = prefix.lower()
+        if not prefix:
+            return []
+        # Short prefixes match huge slices, so their answers are memoized
+        # until the next update
+        cache_key = (prefix, limit) if len(prefix) <= 2 else None
+
+        with self._lock:
+            # Under the lock, so a concurrent update can't clear the memo
+            # between the lookup and the read
+            cached = self._top_cache.get(cache_key)
+            if cached is not None:
+                return cached
+            start = bisect_left(self._entries, prefix)
+            end = bisect_left(self._entries, prefix + '\uffff', lo=start)
+            user_ids = {int(entry.rsplit(SEPARATOR, 1)[1]) for entry in self._entries[start:end]}
+            top = heapq.nlargest(limit, user_ids, key=lambda user_id: (self._users[user_id][2], -user_id))
+            results = [
+                {
+                    'id': user_id,
+                    'username': self._users[user_id][0],
+                    'display_name': self._users[user_id][1],
+                    'followers_count': self._users[user_id][2],
+                }
+                for user_id in top
+            ]
+            if cache_key:
+                self._top_cache[cache_key] = results
+        return results
+
+
+index = AutocompleteIndex()
+_load_lock = threading.Lock()
+
+
+def _active_users():
+    return (
+        User.objects.filter(is_active=True)
+        .order_by('-followers_count')
+        .values_list('id', 'username', 'first_name', 'last_name', 'followers_count')
+        [:settings.AUTOCOMPLETE_MAX_USERS]
+        .iterator(chunk_size=10000)
+    )
+
+
+def _reload():
+    try:
+        index.load(_active_users())
+    finally:
+        connection.close()
+        _load_lock.release()
+
+
+def get_index():
+    """
+    The process-wide index, loaded from the database on first use.
+
+    Once it is older than AUTOCOMPLETE_REFRESH_SECONDS it is rebuilt in a
+    background thread; requests keep searching the current data meanwhile.
+    """
+    if index.loaded_at is None:
+        with _load_lock:
+            if index.loaded_at is None:
+                index.load(_active_users())
+    elif time.monotonic() - index.loaded_at > settings.AUTOCOMPLETE_REFRESH_SECONDS:
+        # Skipped while a rebuild is already running
+        if _load_lock.acquire(blocking=False):
+            threading.Thread(target=_reload, daemon=True).start()
+    return index
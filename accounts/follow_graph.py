@@ -0,0 +1,81 @@
+from array import array
+from bisect import bisect_left
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from rocials_backend import generations
+
+from .models import Follow
+
+
+def _generation_key(user_id):
+    return f'fg:gen:{user_id}'
+
+
+def _key(user_id):
+    """Cache key of the user's current generation of the following set"""
+    [generation] = generations.current(_generation_key(user_id))
+    return f'fg:following:{user_id}:{generation}'
+
+
+def _cached(key):
+    packed = cache.get(key)
+    if packed is None:
+        return None
+    ids = array('q')
+    ids.frombytes(packed)
+    return ids
+
+
+def following_ids(user_id):
+    """
+    IDs of the users ``user_id`` follows, as a sorted ``array('q')``.
+
+    The array is stored as raw bytes in the shared cache (8 bytes per
+    followed user) and rebuilt from the Follow table on a miss. It is
+    cached under the generation read before the rebuild, so a follow that
+    commits meanwhile (and bumps the generation) leaves it unused.
+    """
+    key = _key(user_id)
+    ids = _cached(key)
+    if ids is not None:
+        return ids
+
+    ids = array('q', sorted(
+        Follow.objects.filter(follower_id=user_id).values_list('following_id', flat=True)
+    ))
+    cache.set(key, ids.tobytes(), settings.FOLLOW_GRAPH_CACHE_TIMEOUT)
+    return ids
+
+
+def contains(ids, user_id):
+    """Whether the sorted ``ids`` from following_ids() include ``user_id``"""
+    position = bisect_left(ids, user_id)
+    return position < len(ids) and ids[position] == user_id
+
+
+def is_following(follower_id, user_id):
+    return contains(following_ids(follower_id), user_id)
+
+
+def following_among(follower_id, user_ids):
+    """
+    The subset of ``user_ids`` that ``follower_id`` follows.
+
+    Served from the cached set when present; otherwise one IN query over
+    just these users, so a single page never loads a huge following set.
+    """
+    ids = _cached(_key(follower_id))
+    if ids is not None:
+        return {user_id for user_id in user_ids if contains(ids, user_id)}
+    return set(
+        Follow.objects.filter(follower_id=follower_id, following_id__in=list(user_ids))
+        .values_list('following_id', flat=True)
+    )
+
+
+def invalidate(user_id):
+    """Retire a user's cached following set once a follow or unfollow commits"""
+    transaction.on_commit(lambda: generations.bump(_generation_key(user_id)))
@@ -0,0 +1,59 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.authentication import CachedJWTAuthentication
+from notifications.views import unread_notification_count
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Compare requests/s on the unread notification count endpoint with and without the user cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=5000)
+
+    def measure(self, label, authentication_class, requests):
+        view_class = unread_notification_count.cls
+        original = view_class.authentication_classes
+        view_class.authentication_classes = [authentication_class]
+        try:
+            self.call()
+            queries = []
+
+            def count_query(execute, sql, params, many, context):
+                queries.append(sql)
+                return execute(sql, params, many, context)
+
+            with connection.execute_wrapper(count_query):
+                start = time.perf_counter()
+                for _ in range(requests):
+                    self.call()
+                elapsed = time.perf_counter() - start
+        finally:
+            view_class.authentication_classes = original
+        self.stdout.write(
+            f'{label}: {requests / elapsed:.0f} requests/s, '
+            f'{len(queries) / requests:.1f} queries per request'
+        )
+
+    def call(self):
+        request = self.factory.get('/api/notifications/unread-count/', HTTP_HOST='localhost',
+                                   HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        response = unread_notification_count(request)
+        assert response.status_code == 200, response.data
+
+    def handle(self, *args, **options):
+        self.factory = APIRequestFactory()
+        with transaction.atomic():
+            user = User.objects.create_user(username='bench_auth', email='bench_auth@example.com')
+            self.token = str(AccessToken.for_user(user))
+            self.measure('JWTAuthentication', JWTAuthentication, options['requests'])
+            self.measure('CachedJWTAuthentication', CachedJWTAuthentication, options['requests'])
+            transaction.set_rollback(True)
@@ -0,0 +1,56 @@
+import random
+import statistics
+import string
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+
+from accounts.autocomplete import AutocompleteIndex
+
+
+class Command(BaseCommand):
+    help = 'Measure autocomplete index memory and latency on synthetic users'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1_000_000)
+        parser.add_argument('--queries', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        rng = random.Random(7)
+
+        def word(low, high):
+            return ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(low, high)))
+
+        rows = [
+            (user_id, f'{word(4, 12)}{user_id}', word(3, 9).title(), word(4, 11).title(),
+             int(rng.paretovariate(1.2)))
+            for user_id in range(1, options['users'] + 1)
+        ]
+
+        tracemalloc.start()
+        index = AutocompleteIndex()
+        start = time.perf_counter()
+        index.load(iter(rows))
+        load_time = time.perf_counter() - start
+        del rows
+        used, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        self.stdout.write(
+            f'Loaded {len(index)} users in {load_time:.1f}s: {used / 2 ** 20:.0f} MiB '
+            f'({used / len(index):.0f} bytes/user)'
+        )
+
+        for length in (1, 2, 3, 5):
+            timings = []
+            for _ in range(options['queries']):
+                prefix = word(length, length)
+                start = time.perf_counter()
+                index.search(prefix, 10)
+                timings.append((time.perf_counter() - start) * 1000)
+            timings.sort()
+            self.stdout.write(
+                f'prefix length {length}: p50 {statistics.median(timings):.3f} ms, '
+                f'p99 {timings[int(len(timings) * 0.99) - 1]:.3f} ms'
+            )
@@ -0,0 +1,67 @@
+import time
+import tracemalloc
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from accounts.models import Follow
+from accounts.serializers import UserSerializer
+from accounts.views import get_followers
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Measure peak memory of follower listings on a synthetic creator (rolled back afterwards)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--followers', type=int, default=100_000)
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def measure(self, label, func):
+        tracemalloc.start()
+        start = time.perf_counter()
+        size = func()
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.stdout.write(f'{label}: peak {peak / 2**20:.1f} MiB, {elapsed:.2f}s, {size / 2**20:.1f} MiB body')
+
+    def handle(self, *args, **options):
+        factory = APIRequestFactory()
+        with transaction.atomic():
+            creator = User.objects.create_user(username='bench_creator', email='bench_creator@example.com')
+            start = time.perf_counter()
+            for offset in range(0, options['followers'], options['batch_size']):
+                count = min(options['batch_size'], options['followers'] - offset)
+                users = User.objects.bulk_create([
+                    User(username=f'bench_fan{offset + i}', email=f'bench_fan{offset + i}@example.com')
+                    for i in range(count)
+                ])
+                Follow.objects.bulk_create([Follow(follower=user, following=creator) for user in users])
+            self.stdout.write(f'Seeded {options["followers"]} followers in {time.perf_counter() - start:.1f}s')
+
+            def get(query=''):
+                request = factory.get(f'/api/accounts/followers/{creator.username}/{query}', HTTP_HOST='localhost')
+                force_authenticate(request, user=creator)
+                return get_followers(request, username=creator.username)
+
+            def unpaginated():
+                # The previous implementation: every follower serialized at once
+                followers = [f.follower for f in Follow.objects.filter(following=creator).select_related('follower')]
+                return len(repr(UserSerializer(followers, many=True).data))
+
+            def page():
+                response = get()
+                response.render()
+                return len(response.content)
+
+            def export():
+                return sum(len(line) for line in get('?export=ndjson').streaming_content)
+
+            self.measure('Unpaginated list', unpaginated)
+            self.measure('First page', page)
+            self.measure('NDJSON export', export)
+            transaction.set_rollback(True)
@@ -0,0 +1,51 @@
+import time
+
+from django.contrib.auth import authenticate, get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.views import EmailTokenObtainPairView
+
+User = get_user_model()
+
+EMAIL = 'bench_login@example.com'
+PASSWORD = 'bench-password-123'
+
+
+class Command(BaseCommand):
+    help = 'Measure login throughput of the email/password endpoint (rolled back afterwards)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--logins', type=int, default=20)
+
+    def measure(self, label, func, logins):
+        start = time.perf_counter()
+        for _ in range(logins):
+            func()
+        elapsed = time.perf_counter() - start
+        self.stdout.write(f'{label}: {elapsed / logins * 1000:.1f} ms per login, {logins / elapsed:.1f} logins/s')
+
+    def handle(self, *args, **options):
+        factory = APIRequestFactory()
+        view = EmailTokenObtainPairView.as_view()
+
+        def login():
+            request = factory.post('/api/accounts/login/', {'email': EMAIL, 'password': PASSWORD},
+                                   format='json', HTTP_HOST='localhost')
+            response = view(request)
+            assert response.status_code == 200, response.data
+
+        def double_hash_login():
+            # The previous flow: check the password, then authenticate() again
+            user = User.objects.get(email=EMAIL)
+            assert user.check_password(PASSWORD)
+            user = authenticate(username=user.username, password=PASSWORD)
+            str(RefreshToken.for_user(user).access_token)
+
+        with transaction.atomic():
+            User.objects.create_user(username='bench_login', email=EMAIL, password=PASSWORD)
+            self.measure('Double-hash flow', double_hash_login, options['logins'])
+            self.measure('Login endpoint', login, options['logins'])
+            transaction.set_rollback(True)
@@ -0,0 +1,64 @@
+import random
+import statistics
+import string
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import override_settings
+
+from accounts import autocomplete
+from accounts.models import UserSearchToken
+from accounts.search import search_users, user_tokens
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Measure user search latency by query length, with and without the short-query and candidate limits'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=20_000)
+        parser.add_argument('--queries', type=int, default=200)
+
+    def handle(self, *args, **options):
+        rng = random.Random(7)
+
+        def word(low, high):
+            return ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(low, high)))
+
+        with transaction.atomic():
+            users = User.objects.bulk_create([
+                User(username=f'{word(4, 12)}{i}', email=f'bench_search_{i}@example.com',
+                     first_name=word(3, 9).title(), last_name=word(4, 11).title(),
+                     followers_count=int(rng.paretovariate(1.2)))
+                for i in range(options['users'])
+            ], batch_size=5000)
+            UserSearchToken.objects.bulk_create(
+                [UserSearchToken(user=user, token=token) for user in users for token in user_tokens(user)],
+                batch_size=5000,
+            )
+            autocomplete.index.loaded_at = None
+            autocomplete.get_index()
+
+            queries = {length: [word(length, length) for _ in range(options['queries'])] for length in (1, 2, 3, 5)}
+            self.measure('Unbounded ranking', queries, SEARCH_MIN_QUERY_LENGTH=1, SEARCH_MAX_CANDIDATES=10 ** 9)
+            self.measure('Prefix path + candidate cap', queries)
+            transaction.set_rollback(True)
+        autocomplete.index.loaded_at = None
+
+    def measure(self, label, queries, **overrides):
+        self.stdout.write(label)
+        with override_settings(**overrides):
+            for length, words in queries.items():
+                timings = []
+                for query in words:
+                    start = time.perf_counter()
+                    search_users(query)
+                    timings.append((time.perf_counter() - start) * 1000)
+                timings.sort()
+                self.stdout.write(
+                    f'  query length {length}: p50 {statistics.median(timings):.2f} ms, '
+                    f'p99 {timings[int(len(timings) * 0.99) - 1]:.2f} ms'
+                )
@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from accounts import suggestions
+
+
+class Command(BaseCommand):
+    help = 'Recompute "people you may know" suggestions from the follow graph'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--no-scipy', action='store_true',
+                            help='Use the pure-Python engine even if scipy is installed')
+
+    def handle(self, *args, **options):
+        use_scipy = not options['no_scipy'] and suggestions.sparse is not None
+        started = time.perf_counter()
+        processed = suggestions.compute_suggestions(use_scipy=use_scipy)
+        engine = 'scipy' if use_scipy else 'python'
+        self.stdout.write(
+            f'Computed suggestions for {processed} user(s) with the {engine} engine '
+            f'in {time.perf_counter() - started:.1f}s'
+        )
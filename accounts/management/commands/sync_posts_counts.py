@@ -0,0 +1,58 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from posts.models import Post
+
+User = get_user_model()
+
+
+def actual_posts_count():
+    counts = (
+        Post.objects.filter(author=OuterRef('pk'))
+        .order_by()
+        .values('author')
+        .annotate(total=Count('id'))
+        .values('total')
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+class Command(BaseCommand):
+    help = 'Backfill User.posts_count and repair rows that drifted from the posts table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--loop', type=float, metavar='SECONDS',
+                            help='Keep running, repairing every SECONDS')
+
+    def handle(self, *args, **options):
+        while True:
+            repaired = self.repair(options['batch_size'])
+            self.stdout.write(f'Repaired posts_count for {repaired} user(s)')
+
+            if not options['loop']:
+                break
+            time.sleep(options['loop'])
+
+    def repair(self, batch_size):
+        repaired, last_id = 0, 0
+        while True:
+            batch = list(
+                User.objects.filter(pk__gt=last_id).order_by('pk').values_list('pk', flat=True)[:batch_size]
+            )
+            if not batch:
+                return repaired
+            last_id = batch[-1]
+
+            # One statement, so the count written is the one compared and a
+            # post created or deleted meanwhile can't be overwritten. Only
+            # rows whose column disagrees are written
+            repaired += (
+                User.objects.filter(pk__in=batch)
+                .filter(~Q(posts_count=actual_posts_count()))
+                .update(posts_count=actual_posts_count())
+            )
@@ -0,0 +1,76 @@
+# Generated by Django 6.0.2 on 2026-10-17 01:27
+
+import re
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+TOKEN_MAX_LENGTH = 20
+
+POSTGRES_FORWARDS = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    'CREATE INDEX IF NOT EXISTS accounts_user_username_trgm ON accounts_user '
+    'USING GIN (UPPER(username::text) gin_trgm_ops)',
+    'CREATE INDEX IF NOT EXISTS accounts_user_first_name_trgm ON accounts_user '
+    'USING GIN (UPPER(first_name::text) gin_trgm_ops)',
+    'CREATE INDEX IF NOT EXISTS accounts_user_last_name_trgm ON accounts_user '
+    'USING GIN (UPPER(last_name::text) gin_trgm_ops)',
+]
+POSTGRES_BACKWARDS = [
+    'DROP INDEX IF EXISTS accounts_user_username_trgm',
+    'DROP INDEX IF EXISTS accounts_user_first_name_trgm',
+    'DROP INDEX IF EXISTS accounts_user_last_name_trgm',
+]
+
+
+def create_trigram_indexes(apps, schema_editor):
+    # Match the UPPER(col::text) LIKE expression Django emits for icontains
+    if schema_editor.connection.vendor == 'postgresql':
+        for sql in POSTGRES_FORWARDS:
+            schema_editor.execute(sql)
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        for sql in POSTGRES_BACKWARDS:
+            schema_editor.execute(sql)
+
+
+def backfill_tokens(apps, schema_editor):
+    User = apps.get_model('accounts', 'User')
+    UserSearchToken = apps.get_model('accounts', 'UserSearchToken')
+    batch = []
+    for user in User.objects.only('id', 'username', 'first_name', 'last_name').iterator():
+        tokens = set()
+        for word in re.findall(r'\w+', f'{user.username} {user.first_name} {user.last_name}'.lower()):
+            word = word[:TOKEN_MAX_LENGTH]
+            tokens.update(word[:length] for length in range(1, len(word) + 1))
+        batch += [UserSearchToken(user_id=user.id, token=token) for token in tokens]
+        if len(batch) >= 5000:
+            UserSearchToken.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    UserSearchToken.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_alter_user_cover_photo_alter_user_profile_picture'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserSearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=20)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_tokens', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('token', 'user')},
+            },
+        ),
+        migrations.RunPython(backfill_tokens, migrations.RunPython.noop),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
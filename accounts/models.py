@@ -11,6 +11,7 @@ class User(AbstractUser):
     is_creator = models.BooleanField(default=False)
     followers_count = models.IntegerField(default=0)
     following_count = models.IntegerField(default=0)
+    posts_count = models.IntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -18,6 +19,11 @@ class User(AbstractUser):
     twitter = models.CharField(max_length=100, blank=True)
     instagram = models.CharField(max_length=100, blank=True)
     
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(fields=['-followers_count'], name='user_followers_count_idx'),
+        ]
+    
     def __str__(self):
         return self.username
 
@@ -31,6 +37,33 @@ class Follow(models.Model):
     class Meta:
         unique_together = ('follower', 'following')
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['following', '-created_at'], name='follow_following_created_idx'),
+            models.Index(fields=['follower', '-created_at'], name='follow_follower_created_idx'),
+        ]
     
     def __str__(self):
-        return f"{self.follower.username} follows {self.following.username}"
\ No newline at end of file
+        return f"{self.follower.username} follows {self.following.username}"
+
+
+class UserSearchToken(models.Model):
+    """Lower-cased prefixes of a user's username and names, for indexed search"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='search_tokens')
+    token = models.CharField(max_length=20)
+
+    class Meta:
+        unique_together = ('token', 'user')
+
+
+
+class Suggestion(models.Model):
+    """A precomputed "people you may know" candidate, scored by mutual follows"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='suggestions')
+    suggested = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    mutual_count = models.PositiveIntegerField()
+
+    class Meta:
+        unique_together = ('user', 'suggested')
+        indexes = [
+            models.Index(fields=['user', '-mutual_count'], name='suggestion_user_score_idx'),
+        ]
\ No newline at end of file
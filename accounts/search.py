@@ -0,0 +1,80 @@
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Case, IntegerField, Q, Subquery, Value, When
+
+from .autocomplete import get_index as get_autocomplete_index
+from .models import User, UserSearchToken
+
+TOKEN_MAX_LENGTH = 20
+
+
+def _words(text):
+    return re.findall(r'\w+', text.lower())
+
+
+def user_tokens(user):
+    """Every prefix of every word in the user's username and names"""
+    tokens = set()
+    for word in _words(f'{user.username} {user.first_name} {user.last_name}'):
+        word = word[:TOKEN_MAX_LENGTH]
+        tokens.update(word[:length] for length in range(1, len(word) + 1))
+    return tokens
+
+
+def index_user(user):
+    UserSearchToken.objects.filter(user=user).delete()
+    UserSearchToken.objects.bulk_create(
+        [UserSearchToken(user=user, token=token) for token in user_tokens(user)]
+    )
+
+
+def _prefix_search(query, exclude_id, limit):
+    results = get_autocomplete_index().search(query, limit + 1)
+    user_ids = [result['id'] for result in results if result['id'] != exclude_id][:limit]
+    users = User.objects.in_bulk(user_ids)
+    return [users[user_id] for user_id in user_ids if user_id in users]
+
+
+def search_users(query, exclude_id=None, limit=20):
+    """
+    Users matching ``query``: usernames starting with it first, then by
+    follower count.
+
+    Queries shorter than SEARCH_MIN_QUERY_LENGTH, which neither index can
+    narrow down, only match prefixes and are served from the in-memory
+    autocomplete index. Longer ones match substrings through pg_trgm GIN
+    indexes on Postgres, or word prefixes through UserSearchToken lookups
+    elsewhere; at most SEARCH_MAX_CANDIDATES matches are ranked, so a
+    common query never sorts every match.
+    """
+    if len(query) < settings.SEARCH_MIN_QUERY_LENGTH:
+        return _prefix_search(query, exclude_id, limit)
+
+    if connection.vendor == 'postgresql':
+        users = User.objects.filter(
+            Q(username__icontains=query) |
+            Q(first_name__icontains=query) |
+            Q(last_name__icontains=query)
+        )
+    else:
+        words = _words(query)
+        if not words:
+            return []
+        users = User.objects.all()
+        for word in words:
+            users = users.filter(search_tokens__token=word[:TOKEN_MAX_LENGTH])
+
+    if exclude_id is not None:
+        users = users.exclude(id=exclude_id)
+    candidates = users.order_by().values('id')[:settings.SEARCH_MAX_CANDIDATES]
+    return list(
+        User.objects.filter(id__in=Subquery(candidates)).annotate(
+            prefix_rank=Case(
+                When(username__istartswith=query, then=Value(0)),
+                default=Value(1),
+                output_field=IntegerField(),
+            )
+        ).order_by('prefix_rank', '-followers_count', 'id')[:limit]
+    )
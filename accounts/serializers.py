@@ -1,16 +1,36 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
-from .models import Follow
+from django.contrib.auth.models import update_last_login
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from . import follow_graph
+from .authentication import CachedJWTAuthentication
+from .tokens import RevocableRefreshToken
+from counters import shards
+from rocials_backend.media import media_url
+from rocials_backend.sparse_fields import SparseFieldsetMixin
 
 User = get_user_model()
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSummarySerializer(serializers.ModelSerializer):
+    """Compact representation for users embedded in other resources"""
+    profile_picture_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = User
+        fields = ['id', 'username', 'profile_picture_url']
+        read_only_fields = fields
+
+    def get_profile_picture_url(self, obj):
+        return media_url(obj.profile_picture)
+
+
+class UserSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     followers_count = serializers.IntegerField(read_only=True)
     following_count = serializers.IntegerField(read_only=True)
     is_following = serializers.SerializerMethodField()
-    posts_count = serializers.SerializerMethodField()
+    posts_count = serializers.IntegerField(read_only=True)
     profile_picture_url = serializers.SerializerMethodField()
     cover_photo_url = serializers.SerializerMethodField()
 
@@ -23,25 +43,38 @@ class UserSerializer(serializers.ModelSerializer):
                   'twitter', 'instagram', 'created_at', 'is_following']
         read_only_fields = ['id', 'created_at']
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._viewer_following = None
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # Standalone profiles show live counts; embedded users use the columns
+        if self.parent is None:
+            deltas = shards.pending(User, [instance.pk])
+            for field in ('followers_count', 'following_count'):
+                if field in data:
+                    data[field] += deltas.get((instance.pk, field), 0)
+        return data
+
     def get_profile_picture_url(self, obj):
-        if obj.profile_picture:
-            return obj.profile_picture.url
-        return None
+        return media_url(obj.profile_picture)
 
     def get_cover_photo_url(self, obj):
-        if obj.cover_photo:
-            return obj.cover_photo.url
-        return None
+        return media_url(obj.cover_photo)
 
     def get_is_following(self, obj):
         request = self.context.get('request')
         if request and request.user.is_authenticated:
-            return Follow.objects.filter(follower=request.user, following=obj).exists()
+            # List views resolve follow state for the whole page up front
+            if 'following_ids' in self.context:
+                return obj.id in self.context['following_ids']
+            # Shared by every user in a list, since the child is reused
+            if self._viewer_following is None:
+                self._viewer_following = follow_graph.following_ids(request.user.id)
+            return follow_graph.contains(self._viewer_following, obj.id)
         return False
 
-    def get_posts_count(self, obj):
-        return obj.posts.count()
-
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, min_length=8)
@@ -60,15 +93,9 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         validated_data.pop('password_confirm')
-        profile_picture = validated_data.pop('profile_picture', None)
-
-        user = User.objects.create_user(**validated_data)
-
-        if profile_picture:
-            user.profile_picture = profile_picture
-            user.save()
-
-        return user
+        # A profile picture is saved with the row itself; a second save()
+        # would invalidate cached responses for a user who has none yet
+        return User.objects.create_user(**validated_data)
 
 
 class ProfileUpdateSerializer(serializers.ModelSerializer):
@@ -82,14 +109,10 @@ class ProfileUpdateSerializer(serializers.ModelSerializer):
                   'website', 'twitter', 'instagram']
 
     def get_profile_picture_url(self, obj):
-        if obj.profile_picture:
-            return obj.profile_picture.url
-        return None
+        return media_url(obj.profile_picture)
 
     def get_cover_photo_url(self, obj):
-        if obj.cover_photo:
-            return obj.cover_photo.url
-        return None
+        return media_url(obj.cover_photo)
 
     def validate_bio(self, value):
         if len(value) > 500:
@@ -98,6 +121,8 @@ class ProfileUpdateSerializer(serializers.ModelSerializer):
 
 
 class EmailTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Token pair for an email and password, verified with a single hash"""
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.fields['email'] = serializers.EmailField()
@@ -121,5 +146,37 @@ class EmailTokenObtainPairSerializer(TokenObtainPairSerializer):
         if not user.is_active:
             raise serializers.ValidationError('This account is inactive.')
 
-        attrs['username'] = user.username
-        return super().validate(attrs)
\ No newline at end of file
+        # Issue the pair directly: super().validate() would authenticate()
+        # again, paying for a second user query and password hash
+        self.user = user
+        refresh = self.get_token(user)
+        if api_settings.UPDATE_LAST_LOGIN:
+            update_last_login(None, user)
+        return {'refresh': str(refresh), 'access': str(refresh.access_token)}
+
+
+class CachedTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Refresh without touching the database in the common case.
+
+    Revocation is checked against the in-memory revocation list, the
+    user comes from the authentication cache, and rotated tokens are not
+    recorded as outstanding: blacklist() creates that row on logout.
+    """
+    token_class = RevocableRefreshToken
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        # Raises AuthenticationFailed for unknown and inactive users. Rotated
+        # tokens get a new iat on every use, so cache the user per user only
+        CachedJWTAuthentication().get_cached_user(refresh, iat=None)
+
+        data = {'access': str(refresh.access_token)}
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                refresh.blacklist()
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            data['refresh'] = str(refresh)
+        return data
\ No newline at end of file
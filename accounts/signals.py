@@ -0,0 +1,65 @@
+from django.contrib.auth import get_user_model
+from django.conf import settings
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from counters import shards
+from rocials_backend.response_cache import invalidate
+from . import follow_graph
+from .authentication import invalidate_user
+from .models import Follow
+from .search import index_user
+from .autocomplete import index as autocomplete_index
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User)
+def invalidate_profile_responses(sender, instance, created=False, update_fields=None, **kwargs):
+    # A new user has no cached profile or posts yet
+    if created or (update_fields and set(update_fields) <= {'last_login'}):
+        return
+    # Users are embedded as post authors, so public post lists go stale too
+    invalidate(f'user:{instance.username}', f'user_posts:{instance.username}', 'posts')
+
+
+@receiver(post_save, sender=User)
+def invalidate_authenticated_user(sender, instance, update_fields=None, **kwargs):
+    # Covers profile updates, password changes and deactivation
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    invalidate_user(instance.pk)
+
+
+@receiver(post_save, sender=User)
+def update_search_tokens(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or {'username', 'first_name', 'last_name'} & set(update_fields):
+        index_user(instance)
+
+
+@receiver(post_save, sender=User)
+def update_autocomplete(sender, instance, update_fields=None, **kwargs):
+    # Only keep an already loaded index in sync; a cold one loads everything
+    if autocomplete_index.loaded_at is None or (update_fields and set(update_fields) <= {'last_login'}):
+        return
+    if not instance.is_active:
+        autocomplete_index.remove(instance.id)
+    elif instance.id in autocomplete_index or len(autocomplete_index) < settings.AUTOCOMPLETE_MAX_USERS:
+        autocomplete_index.add(instance.id, instance.username, instance.first_name,
+                               instance.last_name, instance.followers_count)
+
+
+@receiver(post_delete, sender=User)
+def remove_from_autocomplete(sender, instance, **kwargs):
+    autocomplete_index.remove(instance.id)
+    invalidate_user(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def discard_counter_shards(sender, instance, **kwargs):
+    shards.discard(instance)
+
+
+@receiver([post_save, post_delete], sender=Follow)
+def invalidate_follow_graph(sender, instance, **kwargs):
+    follow_graph.invalidate(instance.follower_id)
\ No newline at end of file
@@ -0,0 +1,100 @@
+import heapq
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+
+from .models import Follow, Suggestion
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:
+    sparse = None
+
+
+def _sparse_candidates(edges, limit, batch_size):
+    """Two-hop follow counts as a sparse matrix product, one block of rows at a time"""
+    pairs = np.array(edges, dtype=np.int64).reshape(-1, 2)
+    user_ids, index = np.unique(pairs.ravel(), return_inverse=True)
+    index = index.reshape(-1, 2)
+    size = len(user_ids)
+    graph = sparse.csr_matrix(
+        (np.ones(len(index), dtype=np.int32), (index[:, 0], index[:, 1])), shape=(size, size)
+    )
+    graph.sum_duplicates()
+
+    for start in range(0, size, batch_size):
+        block = graph[start:start + batch_size]
+        two_hop = (block @ graph).tocsr()
+        for row in range(block.shape[0]):
+            lo, hi = two_hop.indptr[row], two_hop.indptr[row + 1]
+            followed = block.indices[block.indptr[row]:block.indptr[row + 1]]
+            if not len(followed):
+                continue
+            columns, counts = two_hop.indices[lo:hi], two_hop.data[lo:hi]
+            keep = ~np.isin(columns, followed) & (columns != start + row)
+            columns, counts = columns[keep], counts[keep]
+            if len(columns) > limit:
+                top = np.argpartition(-counts, limit)[:limit]
+                columns, counts = columns[top], counts[top]
+            yield int(user_ids[start + row]), list(zip(user_ids[columns].tolist(), counts.tolist()))
+
+
+def _python_candidates(edges, limit):
+    following = defaultdict(set)
+    for follower_id, following_id in edges:
+        following[follower_id].add(following_id)
+
+    for user_id, followed in following.items():
+        counts = Counter()
+        for friend_id in followed:
+            counts.update(following.get(friend_id, ()))
+        counts.pop(user_id, None)
+        for friend_id in followed:
+            counts.pop(friend_id, None)
+        yield user_id, heapq.nlargest(limit, counts.items(), key=lambda item: (item[1], -item[0]))
+
+
+def _replace(user_ids, suggestions):
+    with transaction.atomic():
+        Suggestion.objects.filter(user_id__in=user_ids).delete()
+        Suggestion.objects.bulk_create(suggestions)
+
+
+def compute_suggestions(use_scipy=True):
+    """
+    Rebuild the Suggestion table from the Follow edge list.
+
+    A candidate's score is the number of users someone follows who follow
+    the candidate. Accounts the user already follows are left out. Users
+    are rewritten in batches, so readers never see a half-written user.
+    Returns the number of users processed.
+    """
+    limit = settings.SUGGESTIONS_PER_USER
+    batch_size = settings.SUGGESTIONS_BATCH_SIZE
+    edges = list(Follow.objects.values_list('follower_id', 'following_id').iterator(chunk_size=10000))
+    if use_scipy and sparse is not None and edges:
+        candidates = _sparse_candidates(edges, limit, batch_size)
+    else:
+        candidates = _python_candidates(edges, limit)
+
+    processed, user_ids, suggestions = 0, [], []
+    for user_id, scored in candidates:
+        user_ids.append(user_id)
+        suggestions += [
+            Suggestion(user_id=user_id, suggested_id=suggested_id, mutual_count=mutual_count)
+            for suggested_id, mutual_count in scored
+        ]
+        if len(user_ids) >= batch_size:
+            _replace(user_ids, suggestions)
+            processed += len(user_ids)
+            user_ids, suggestions = [], []
+    if user_ids:
+        _replace(user_ids, suggestions)
+        processed += len(user_ids)
+
+    # Users who no longer follow anyone have no candidates left
+    Suggestion.objects.filter(~Exists(Follow.objects.filter(follower_id=OuterRef('user_id')))).delete()
+    return processed
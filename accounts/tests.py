@@ -1,3 +1,121 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from . import autocomplete
+from .models import Follow
+from .tokens import RevocationList
+
+User = get_user_model()
+
+
+class UserListQueryCountTests(TestCase):
+    """User list endpoints must not run queries per listed user"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.viewer = User.objects.create_user('viewer', 'viewer@example.com', 'password123')
+        cls.target = User.objects.create_user('target', 'target@example.com', 'password123')
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.viewer)
+        self.created = 0
+
+    def add_users(self, count):
+        for _ in range(count):
+            i = self.created
+            self.created += 1
+            user = User.objects.create_user(f'match{i}', f'match{i}@example.com', None,
+                                            followers_count=i)
+            Follow.objects.create(follower=user, following=self.target)
+            Follow.objects.create(follower=self.target, following=user)
+            if i % 2:
+                Follow.objects.create(follower=self.viewer, following=user)
+
+    def assertConstantQueries(self, url):
+        self.add_users(2)
+        cache.clear()
+        with CaptureQueriesContext(connection) as small_page:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+        self.add_users(18)
+        cache.clear()
+        with self.assertNumQueries(len(small_page.captured_queries)):
+            response = self.client.get(url)
+
+        users = response.data['results'] if isinstance(response.data, dict) else response.data
+        listed = [user for user in users if user['username'].startswith('match')]
+        self.assertEqual(len(listed), 20)
+        for user in listed:
+            self.assertEqual(user['is_following'], int(user['username'][5:]) % 2 == 1)
+
+    def test_followers(self):
+        self.assertConstantQueries('/api/accounts/followers/target/')
+
+    def test_following(self):
+        self.assertConstantQueries('/api/accounts/following/target/')
+
+    def test_discover(self):
+        self.assertConstantQueries('/api/accounts/discover/')
+
+    def test_search(self):
+        self.assertConstantQueries('/api/accounts/search/?q=match')
+
+    def test_short_search(self):
+        # Served from the autocomplete index, which is loaded once up front
+        autocomplete.index.loaded_at = None
+        autocomplete.get_index()
+        self.assertConstantQueries('/api/accounts/search/?q=ma')
+
+
+class RefreshTokenRevocationTests(TestCase):
+    """Logged-out refresh tokens are rejected, however their blacklist rows arrive"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('alice', 'alice@example.com', 'password123')
+        self.client = APIClient()
+
+    def test_logged_out_refresh_token_is_rejected(self):
+        response = self.client.post('/api/accounts/login/', {'email': 'alice@example.com', 'password': 'password123'})
+        refresh = response.data['refresh']
+        self.assertEqual(self.client.post('/api/accounts/token/refresh/', {'refresh': refresh}).status_code, 200)
+
+        self.client.force_authenticate(self.user)
+        self.client.post('/api/accounts/logout/', {'refresh': refresh})
+        self.assertEqual(self.client.post('/api/accounts/token/refresh/', {'refresh': refresh}).status_code, 401)
+
+    @override_settings(REVOCATION_SYNC_OVERLAP=100)
+    def test_sync_picks_up_rows_committed_out_of_id_order(self):
+        tokens = [RefreshToken.for_user(self.user) for _ in range(3)]
+        outstanding = [OutstandingToken.objects.get(jti=token['jti']) for token in tokens]
+        revocations = RevocationList()
+        clock = [1000.0]
+
+        with mock.patch('accounts.tokens.time.monotonic', lambda: clock[0]):
+            BlacklistedToken.objects.create(id=10, token=outstanding[0])
+            revocations.sync()
+            # A lower ID that commits after ID 10 was read
+            BlacklistedToken.objects.create(id=5, token=outstanding[1])
+            clock[0] += 60
+            revocations.sync()
+            self.assertTrue(revocations.is_revoked(tokens[1]['jti']))
+
+            # Once the overlap has passed, syncs start from the old high-water mark
+            clock[0] += 200
+            revocations.sync()
+            BlacklistedToken.objects.create(id=11, token=outstanding[2])
+            clock[0] += 60
+            revocations.sync()
+            self.assertTrue(revocations.is_revoked(tokens[2]['jti']))
+        self.assertEqual(len(revocations), 3)
@@ -0,0 +1,89 @@
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+def _revoked_key(jti):
+    return f'jwt:revoked:{jti}'
+
+
+class RevocationList:
+    """
+    In-process map of revoked refresh token JTIs to their expiry time.
+
+    It loads from BlacklistedToken on first use and then pulls newly
+    blacklisted rows every REVOCATION_SYNC_SECONDS, dropping expired JTIs
+    as it goes. Revocations are also written to the shared cache so other
+    workers see a logout before their next sync.
+    """
+
+    def __init__(self):
+        self._expiry = {}
+        # (monotonic time, highest row ID read) after each sync
+        self._high_water = deque()
+        self._synced_at = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._expiry)
+
+    def sync(self):
+        now, tick = time.time(), time.monotonic()
+        with self._lock:
+            # Rows can commit out of ID order, so each sync starts from the
+            # highest ID read at least REVOCATION_SYNC_OVERLAP seconds ago
+            # rather than the latest one; until then it reads everything
+            cutoff = tick - settings.REVOCATION_SYNC_OVERLAP
+            while len(self._high_water) > 1 and self._high_water[1][0] <= cutoff:
+                self._high_water.popleft()
+            floor = self._high_water[0][1] if self._high_water and self._high_water[0][0] <= cutoff else 0
+            last_id = self._high_water[-1][1] if self._high_water else 0
+
+            rows = (
+                BlacklistedToken.objects.filter(id__gt=floor)
+                .order_by('id')
+                .values_list('id', 'token__jti', 'token__expires_at')
+            )
+            for row_id, jti, expires_at in rows.iterator(chunk_size=5000):
+                last_id = max(last_id, row_id)
+                if expires_at.timestamp() > now:
+                    self._expiry[jti] = expires_at.timestamp()
+            self._expiry = {jti: exp for jti, exp in self._expiry.items() if exp > now}
+            self._high_water.append((tick, last_id))
+            self._synced_at = tick
+
+    def revoke(self, jti, exp):
+        with self._lock:
+            self._expiry[jti] = exp
+        cache.set(_revoked_key(jti), 1, max(int(exp - time.time()), 1))
+
+    def is_revoked(self, jti):
+        if self._synced_at is None or time.monotonic() - self._synced_at > settings.REVOCATION_SYNC_SECONDS:
+            self.sync()
+        exp = self._expiry.get(jti)
+        if exp is not None and exp > time.time():
+            return True
+        return cache.get(_revoked_key(jti)) is not None
+
+
+revoked_tokens = RevocationList()
+
+
+class RevocableRefreshToken(RefreshToken):
+    """Refresh token checked against the in-memory revocation list instead of the blacklist table"""
+
+    def check_blacklist(self):
+        if revoked_tokens.is_revoked(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError('Token is blacklisted')
+
+    def blacklist(self):
+        blacklisted = super().blacklist()
+        revoked_tokens.revoke(self.payload[api_settings.JTI_CLAIM], self.payload['exp'])
+        return blacklisted
@@ -18,6 +18,7 @@ urlpatterns = [
 
     # Search & Discovery
     path('search/', views.search_users, name='search-users'),
+    path('autocomplete/', views.autocomplete_users, name='autocomplete-users'),
     path('discover/', views.discover_users, name='discover-users'),
 
     # Follow system
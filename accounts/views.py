@@ -1,26 +1,74 @@
 # accounts/views.py
 
+import json
+
 from rest_framework import generics, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenObtainPairView
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db.models import Q
-
-from .models import Follow
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils.decorators import method_decorator
+
+from .models import Follow, Suggestion
+from . import follow_graph, search
+from .tokens import RevocableRefreshToken
+from .autocomplete import get_index as get_autocomplete_index
 from .serializers import (
     UserSerializer,
+    UserSummarySerializer,
     UserRegistrationSerializer,
     ProfileUpdateSerializer,
     EmailTokenObtainPairSerializer
 )
 from notifications.models import Notification
+from counters import shards
+from posts.feed import backfill_author, prune_author
+from rocials_backend.pagination import CreatedAtCursorPagination
+from rocials_backend.response_cache import cached_response, invalidate
 
 User = get_user_model()
 
 
+def user_list_context(request, users):
+    """Serializer context resolving the viewer's follow state for ``users`` at once"""
+    return {
+        'request': request,
+        'following_ids': follow_graph.following_among(request.user.id, [user.id for user in users]),
+    }
+
+
+def _ndjson_export(follows, user_field):
+    """Stream one JSON line per listed user, reading rows in bounded chunks"""
+    serializer = UserSummarySerializer()
+    for follow in follows.iterator(chunk_size=settings.FOLLOW_EXPORT_CHUNK_SIZE):
+        row = serializer.to_representation(getattr(follow, user_field))
+        row['followed_at'] = follow.created_at
+        yield json.dumps(row, cls=DjangoJSONEncoder) + '\n'
+
+
+def follow_listing(request, follows, user_field):
+    """
+    One cursor-paginated page of the ``user_field`` side of ``follows``,
+    newest first, or the whole list as NDJSON with ``?export=ndjson``.
+    """
+    follows = follows.select_related(user_field)
+    if request.GET.get('export') == 'ndjson':
+        return StreamingHttpResponse(
+            _ndjson_export(follows.order_by('-created_at', '-id'), user_field),
+            content_type='application/x-ndjson',
+        )
+
+    paginator = CreatedAtCursorPagination()
+    users = [getattr(follow, user_field) for follow in paginator.paginate_queryset(follows, request)]
+    serializer = UserSerializer(users, many=True, context=user_list_context(request, users))
+    return paginator.get_paginated_response(serializer.data)
+
+
 # -----------------------------
 # Login with Email (JWT)
 # -----------------------------
@@ -38,7 +86,9 @@ def get_current_user(request):
     """
     Returns the current logged-in user details.
     """
-    serializer = UserSerializer(request.user, context={'request': request})
+    # request.user may be a cached copy; profiles show the current row
+    user = User.objects.get(pk=request.user.pk)
+    serializer = UserSerializer(user, context={'request': request})
     return Response(serializer.data)
 
 
@@ -77,12 +127,14 @@ class ProfileView(generics.RetrieveUpdateAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_object(self):
-        return self.request.user
+        # Saving a cached request.user would write back stale counters
+        return User.objects.get(pk=self.request.user.pk)
 
 
 # -----------------------------
 # View other users by username
 # -----------------------------
+@method_decorator(cached_response('user:{username}'), name='retrieve')
 class UserDetailView(generics.RetrieveAPIView):
     queryset = User.objects.all()
     serializer_class = UserSerializer
@@ -100,24 +152,52 @@ def search_users(request):
     if not query:
         return Response({'results': []})
 
-    users = User.objects.filter(
-        Q(username__icontains=query) |
-        Q(first_name__icontains=query) |
-        Q(last_name__icontains=query)
-    ).exclude(id=request.user.id)[:20]
+    users = list(search.search_users(query, exclude_id=request.user.id))
 
-    serializer = UserSerializer(users, many=True, context={'request': request})
+    serializer = UserSerializer(users, many=True, context=user_list_context(request, users))
     return Response({'results': serializer.data})
 
 
+# -----------------------------
+# Username autocomplete
+# -----------------------------
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def autocomplete_users(request):
+    """
+    Top users by follower count whose username or name starts with ``q``,
+    served from the in-memory autocomplete index.
+    """
+    query = request.GET.get('q', '').strip()
+    try:
+        limit = min(max(int(request.GET.get('limit', 10)), 1), 25)
+    except ValueError:
+        limit = 10
+    return Response({'results': get_autocomplete_index().search(query, limit)})
+
+
 # -----------------------------
 # Discover users
 # -----------------------------
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def discover_users(request):
-    users = User.objects.exclude(id=request.user.id).order_by('-followers_count')[:50]
-    serializer = UserSerializer(users, many=True, context={'request': request})
+    """
+    People the user may know, from the precomputed Suggestion table (see
+    compute_suggestions). Users without suggestions yet get the most
+    followed accounts.
+    """
+    followed = Follow.objects.filter(follower=request.user).values('following_id')
+    suggestions = (
+        Suggestion.objects.filter(user=request.user)
+        .exclude(suggested_id__in=followed)
+        .select_related('suggested')
+        .order_by('-mutual_count')[:50]
+    )
+    users = [suggestion.suggested for suggestion in suggestions]
+    if not users:
+        users = list(User.objects.exclude(id=request.user.id).order_by('-followers_count')[:50])
+    serializer = UserSerializer(users, many=True, context=user_list_context(request, users))
     return Response(serializer.data)
 
 
@@ -142,16 +222,16 @@ def follow_user(request, username):
 
     if not created:
         follow.delete()
-        target_user.followers_count = max(0, target_user.followers_count - 1)
-        request.user.following_count = max(0, request.user.following_count - 1)
-        target_user.save()
-        request.user.save()
+        shards.increment(target_user, 'followers_count', -1)
+        shards.increment(request.user, 'following_count', -1)
+        invalidate(f'user:{target_user.username}', f'user:{request.user.username}')
+        prune_author(request.user, target_user)
         return Response({'message': 'Unfollowed', 'is_following': False})
     else:
-        target_user.followers_count += 1
-        request.user.following_count += 1
-        target_user.save()
-        request.user.save()
+        shards.increment(target_user, 'followers_count')
+        shards.increment(request.user, 'following_count')
+        invalidate(f'user:{target_user.username}', f'user:{request.user.username}')
+        backfill_author(request.user, target_user)
 
         # Create notification
         Notification.objects.create(
@@ -176,9 +256,7 @@ def get_followers(request, username):
     except User.DoesNotExist:
         return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
 
-    followers = Follow.objects.filter(following=target_user).select_related('follower')
-    serializer = UserSerializer([f.follower for f in followers], many=True, context={'request': request})
-    return Response(serializer.data)
+    return follow_listing(request, Follow.objects.filter(following=target_user), 'follower')
 
 
 # -----------------------------
@@ -192,9 +270,7 @@ def get_following(request, username):
     except User.DoesNotExist:
         return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
 
-    following = Follow.objects.filter(follower=target_user).select_related('following')
-    serializer = UserSerializer([f.following for f in following], many=True, context={'request': request})
-    return Response(serializer.data)
+    return follow_listing(request, Follow.objects.filter(follower=target_user), 'following')
 
 
 # -----------------------------
@@ -210,7 +286,7 @@ def logout_view(request):
     try:
         refresh_token = request.data.get('refresh')
         if refresh_token:
-            token = RefreshToken(refresh_token)
+            token = RevocableRefreshToken(refresh_token)
             token.blacklist()
         return Response({'message': 'Logged out successfully'}, status=status.HTTP_200_OK)
     except Exception:
@@ -0,0 +1,7 @@
+from django.contrib import admin
+from .models import CounterShard
+
+@admin.register(CounterShard)
+class CounterShardAdmin(admin.ModelAdmin):
+    list_display = ['content_type', 'object_id', 'field', 'shard', 'delta']
+    list_filter = ['content_type', 'field']
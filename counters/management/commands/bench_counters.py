@@ -0,0 +1,74 @@
+import threading
+import time
+
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from counters import shards
+from counters.models import CounterShard
+from posts.models import Post
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Benchmark concurrent likes on a single post: row update vs sharded counter'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=8)
+        parser.add_argument('--likes', type=int, default=200, help='Increments per worker')
+
+    def handle(self, *args, **options):
+        workers, likes = options['workers'], options['likes']
+        user = User.objects.create_user(username='bench_counters', email='bench_counters@example.com')
+        post = Post.objects.create(author=user, post_type='text', content='bench')
+        post_shards = CounterShard.objects.filter(
+            content_type=ContentType.objects.get_for_model(Post), object_id=post.pk
+        )
+        try:
+            def read_modify_write():
+                # What like_post used to do
+                with transaction.atomic():
+                    p = Post.objects.select_for_update().get(pk=post.pk)
+                    p.likes_count += 1
+                    p.save()
+
+            def sharded():
+                shards.increment(post, 'likes_count')
+
+            for name, operation in (('row update', read_modify_write), ('sharded', sharded)):
+                Post.objects.filter(pk=post.pk).update(likes_count=0)
+                post_shards.delete()
+                elapsed, errors = self.run_workers(operation, workers, likes)
+                post.refresh_from_db()
+                total = shards.get_count(post, 'likes_count')
+                self.stdout.write(
+                    f'{name:>10}: {workers * likes / elapsed:8.0f} likes/s '
+                    f'({total}/{workers * likes} counted, {errors} errors)'
+                )
+        finally:
+            post_shards.delete()
+            user.delete()
+
+    def run_workers(self, operation, workers, likes):
+        errors = []
+
+        def worker():
+            try:
+                for _ in range(likes):
+                    try:
+                        operation()
+                    except Exception:
+                        errors.append(1)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(workers)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return time.perf_counter() - start, len(errors)
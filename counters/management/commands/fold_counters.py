@@ -0,0 +1,29 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from counters.shards import fold
+from posts.models import Post
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Fold sharded counter deltas into the denormalized count columns'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', type=float, metavar='SECONDS',
+                            help='Keep running, folding every SECONDS')
+
+    def handle(self, *args, **options):
+        while True:
+            post_ids = fold(Post)
+            if post_ids:
+                Post.refresh_trending_scores(post_ids)
+            user_ids = fold(User)
+            self.stdout.write(f'Folded counters for {len(post_ids)} post(s) and {len(user_ids)} user(s)')
+
+            if not options['loop']:
+                break
+            time.sleep(options['loop'])
@@ -0,0 +1,22 @@
+from django.db import models
+from django.contrib.contenttypes.models import ContentType
+
+
+class CounterShard(models.Model):
+    """
+    One slot of a sharded counter.
+
+    Holds increments not yet folded into the denormalized count column
+    (e.g. Post.likes_count) of the object it points at.
+    """
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveBigIntegerField()
+    field = models.CharField(max_length=50)
+    shard = models.PositiveSmallIntegerField()
+    delta = models.BigIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('content_type', 'object_id', 'field', 'shard')
+
+    def __str__(self):
+        return f"{self.content_type.model}#{self.object_id}.{self.field}[{self.shard}] {self.delta:+d}"
@@ -0,0 +1,117 @@
+import random
+from collections import defaultdict
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+
+from .models import CounterShard
+
+
+def increment(obj, field, amount=1):
+    """
+    Add ``amount`` to ``obj.<field>`` without touching the object's row.
+
+    The increment lands in a randomly chosen shard, so concurrent writers
+    on the same object rarely wait on the same row lock.
+    """
+    content_type = ContentType.objects.get_for_model(obj)
+    lookup = {
+        'content_type': content_type,
+        'object_id': obj.pk,
+        'field': field,
+        'shard': random.randrange(settings.COUNTER_SHARDS),
+    }
+    if CounterShard.objects.filter(**lookup).update(delta=F('delta') + amount):
+        return
+    try:
+        with transaction.atomic():
+            CounterShard.objects.create(delta=amount, **lookup)
+    except IntegrityError:
+        # Another writer created the shard first
+        CounterShard.objects.filter(**lookup).update(delta=F('delta') + amount)
+
+
+def pending(model, object_ids):
+    """Unfolded deltas for many objects in one query: {(object_id, field): delta}"""
+    rows = (
+        CounterShard.objects.filter(
+            content_type=ContentType.objects.get_for_model(model),
+            object_id__in=list(object_ids),
+        )
+        .values('object_id', 'field')
+        .annotate(total=Sum('delta'))
+    )
+    return {(row['object_id'], row['field']): row['total'] for row in rows if row['total']}
+
+
+def get_count(obj, field):
+    """Current value of a sharded counter: the column plus unfolded shards"""
+    return getattr(obj, field) + pending(type(obj), [obj.pk]).get((obj.pk, field), 0)
+
+
+def apply_pending(obj, fields):
+    """Add unfolded deltas to the in-memory counter attributes of ``obj``"""
+    deltas = pending(type(obj), [obj.pk])
+    for field in fields:
+        setattr(obj, field, getattr(obj, field) + deltas.get((obj.pk, field), 0))
+    return obj
+
+
+def discard(obj):
+    """Drop the shards of a deleted object"""
+    CounterShard.objects.filter(content_type=ContentType.objects.get_for_model(obj), object_id=obj.pk).delete()
+
+
+def _fold_batch(model, content_type, object_ids):
+    with transaction.atomic():
+        shards = list(
+            CounterShard.objects.select_for_update()
+            .filter(content_type=content_type, object_id__in=object_ids)
+            .exclude(delta=0)
+            .values_list('pk', 'object_id', 'field', 'delta')
+        )
+        totals = defaultdict(dict)
+        shards_by_delta = defaultdict(list)
+        for pk, object_id, field, delta in shards:
+            totals[object_id][field] = totals[object_id].get(field, 0) + delta
+            shards_by_delta[delta].append(pk)
+
+        for delta, pks in shards_by_delta.items():
+            CounterShard.objects.filter(pk__in=pks).update(delta=F('delta') - delta)
+        # Still locked, so nothing was added to the drained rows since
+        CounterShard.objects.filter(pk__in=[pk for pk, *_ in shards], delta=0).delete()
+
+        for object_id, fields in totals.items():
+            model.objects.filter(pk=object_id).update(
+                **{field: F(field) + delta for field, delta in fields.items()}
+            )
+    return set(totals)
+
+
+def fold(model):
+    """
+    Move shard deltas into the model's count columns.
+
+    Objects are folded COUNTER_FOLD_BATCH_SIZE at a time, each batch in
+    its own short transaction, so increments only wait on the shards of
+    the batch being folded. Each shard is decremented by exactly the
+    amount folded, so increments that land while folding are kept for the
+    next run; drained shards are deleted. Returns the IDs of the objects
+    whose columns changed.
+    """
+    content_type = ContentType.objects.get_for_model(model)
+    # Shards that went back to zero between folds hold nothing to fold
+    CounterShard.objects.filter(content_type=content_type, delta=0).delete()
+    object_ids = list(
+        CounterShard.objects.filter(content_type=content_type)
+        .order_by('object_id')
+        .values_list('object_id', flat=True)
+        .distinct()
+    )
+    folded_ids = set()
+    batch_size = settings.COUNTER_FOLD_BATCH_SIZE
+    for start in range(0, len(object_ids), batch_size):
+        folded_ids |= _fold_batch(model, content_type, object_ids[start:start + batch_size])
+    return folded_ids
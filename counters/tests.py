@@ -0,0 +1,69 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+
+from posts.models import Post
+from . import shards
+from .models import CounterShard
+
+User = get_user_model()
+
+
+@override_settings(COUNTER_FOLD_BATCH_SIZE=1)
+class FoldTests(TestCase):
+    """fold() moves shard deltas into count columns without losing increments"""
+
+    def setUp(self):
+        self.author = User.objects.create_user('author', 'author@example.com', 'password123')
+        self.first = Post.objects.create(author=self.author, post_type='text', content='first')
+        self.second = Post.objects.create(author=self.author, post_type='text', content='second')
+
+    def test_fold_moves_deltas_into_columns(self):
+        for _ in range(5):
+            shards.increment(self.first, 'likes_count')
+        shards.increment(self.first, 'likes_count', -1)
+        shards.increment(self.second, 'comments_count', 3)
+
+        self.assertEqual(shards.fold(Post), {self.first.id, self.second.id})
+
+        self.first.refresh_from_db()
+        self.second.refresh_from_db()
+        self.assertEqual(self.first.likes_count, 4)
+        self.assertEqual(self.second.comments_count, 3)
+        # Drained shards are deleted
+        self.assertFalse(CounterShard.objects.exists())
+
+    def test_increments_during_fold_are_kept(self):
+        shards.increment(self.first, 'likes_count')
+        shards.increment(self.second, 'likes_count')
+        fold_batch = shards._fold_batch
+
+        def fold_batch_with_traffic(*args):
+            folded = fold_batch(*args)
+            # Likes landing while the fold is still running
+            shards.increment(self.first, 'likes_count')
+            shards.increment(self.second, 'likes_count')
+            return folded
+
+        with mock.patch.object(shards, '_fold_batch', fold_batch_with_traffic):
+            shards.fold(Post)
+
+        self.first.refresh_from_db()
+        self.second.refresh_from_db()
+        self.assertEqual(shards.get_count(self.first, 'likes_count'), 3)
+        self.assertEqual(shards.get_count(self.second, 'likes_count'), 3)
+
+        shards.fold(Post)
+        self.first.refresh_from_db()
+        self.second.refresh_from_db()
+        self.assertEqual((self.first.likes_count, self.second.likes_count), (3, 3))
+        self.assertFalse(CounterShard.objects.exists())
+
+    def test_deleting_an_object_discards_its_shards(self):
+        shards.increment(self.first, 'likes_count')
+        shards.increment(self.author, 'followers_count')
+        self.first.delete()
+        self.assertFalse(CounterShard.objects.filter(object_id=self.first.id, field='likes_count').exists())
+        self.author.delete()
+        self.assertFalse(CounterShard.objects.exists())
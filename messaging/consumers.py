@@ -2,7 +2,9 @@ import json
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
 from django.contrib.auth import get_user_model
-from .models import Conversation, Message
+from django.db import DatabaseError
+from .models import ConversationMember
+from .write_buffer import get_buffer
 from notifications.models import Notification
 
 User = get_user_model()
@@ -42,6 +44,12 @@ class ChatConsumer(AsyncWebsocketConsumer):
         self.conversation_id = self.scope['url_route']['kwargs']['conversation_id']
         self.room_group_name = f'chat_{self.conversation_id}'
         
+        # Membership is checked once here, so receive() needs no lookups
+        user = self.scope.get('user')
+        if not (user and user.is_authenticated and await self.is_member(user)):
+            await self.close()
+            return
+        
         await self.channel_layer.group_add(self.room_group_name, self.channel_name)
         await self.accept()
     
@@ -52,36 +60,42 @@ class ChatConsumer(AsyncWebsocketConsumer):
         data = json.loads(text_data)
         message_content = data['message']
         
-        message = await self.save_message(message_content)
+        try:
+            message = await get_buffer().write(self.conversation_id, self.scope['user'].id, message_content)
+        except DatabaseError:
+            await self.send(text_data=json.dumps({
+                'type': 'message_error',
+                'client_id': data.get('client_id'),
+                'error': 'Message could not be saved'
+            }))
+            return
+        created_at = message.created_at.isoformat()
         
+        await self.send(text_data=json.dumps({
+            'type': 'message_ack',
+            'client_id': data.get('client_id'),
+            'id': message.id,
+            'created_at': created_at
+        }))
         await self.channel_layer.group_send(
             self.room_group_name,
             {
                 'type': 'chat_message',
+                'id': message.id,
                 'message': message_content,
-                'sender': message['sender'],
-                'created_at': message['created_at']
+                'sender': self.scope['user'].username,
+                'created_at': created_at
             }
         )
     
     async def chat_message(self, event):
         await self.send(text_data=json.dumps({
+            'id': event['id'],
             'message': event['message'],
             'sender': event['sender'],
             'created_at': event['created_at']
         }))
     
     @database_sync_to_async
-    def save_message(self, content):
-        user = self.scope['user']
-        conversation = Conversation.objects.get(id=self.conversation_id)
-        message = Message.objects.create(
-            conversation=conversation,
-            sender=user,
-            content=content
-        )
-        return {
-            'id': message.id,
-            'sender': user.username,
-            'created_at': message.created_at.isoformat()
-        }
\ No newline at end of file
+    def is_member(self, user):
+        return ConversationMember.objects.filter(conversation_id=self.conversation_id, user=user).exists()
\ No newline at end of file
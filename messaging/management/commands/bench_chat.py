@@ -0,0 +1,77 @@
+import asyncio
+import json
+import time
+
+from asgiref.sync import async_to_sync
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from messaging.models import Conversation, ConversationMember, Message
+from messaging.routing import websocket_urlpatterns
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Measure chat messages/s over websockets with and without the message write buffer'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=50)
+        parser.add_argument('--messages', type=int, default=40, help='Messages sent by each client')
+
+    async def client(self, application, user, conversation_id, messages):
+        communicator = WebsocketCommunicator(application, f'/ws/chat/{conversation_id}/')
+        communicator.scope['user'] = user
+        connected, _ = await communicator.connect()
+        assert connected
+        for i in range(messages):
+            await communicator.send_to(text_data=json.dumps({'message': f'message {i}', 'client_id': i}))
+            # Skip the room broadcast until the sender's own ack arrives
+            while True:
+                event = json.loads(await communicator.receive_from(timeout=10))
+                if event.get('type') == 'message_ack':
+                    assert event['client_id'] == i and event['id'], event
+                    break
+        await communicator.disconnect()
+
+    async def run_clients(self, rooms, messages):
+        application = URLRouter(websocket_urlpatterns)
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            self.client(application, user, conversation_id, messages) for user, conversation_id in rooms
+        ))
+        return time.perf_counter() - start
+
+    def measure(self, label, rooms, messages):
+        elapsed = async_to_sync(self.run_clients)(rooms, messages)
+        total = len(rooms) * messages
+        self.stdout.write(f'{label}: {total / elapsed:.0f} messages/s ({total} messages in {elapsed:.2f}s)')
+
+    def handle(self, *args, **options):
+        # The consumers write from another thread, so this can't run in a
+        # rolled-back transaction; everything created is deleted at the end
+        partner = User.objects.create_user(username='bench_chat_partner', email='bench_chat_partner@example.com')
+        users = User.objects.bulk_create([
+            User(username=f'bench_chat_{i}', email=f'bench_chat_{i}@example.com') for i in range(options['clients'])
+        ])
+        conversations = Conversation.objects.bulk_create([Conversation() for _ in users])
+        try:
+            ConversationMember.objects.bulk_create([
+                ConversationMember(conversation=conversation, user=member)
+                for conversation, user in zip(conversations, users)
+                for member in (user, partner)
+            ])
+            rooms = [(user, conversation.id) for user, conversation in zip(users, conversations)]
+
+            with override_settings(CHAT_WRITE_BUFFER_SIZE=1):
+                self.measure('One INSERT per message', rooms, options['messages'])
+            self.measure('Write buffer', rooms, options['messages'])
+
+            saved = Message.objects.filter(conversation__in=conversations).count()
+            self.stdout.write(f'{saved} messages saved')
+        finally:
+            Conversation.objects.filter(id__in=[conversation.id for conversation in conversations]).delete()
+            User.objects.filter(id__in=[user.id for user in users] + [partner.id]).delete()
@@ -0,0 +1,69 @@
+# Generated by Django 6.0.2 on 2026-10-17 01:58
+
+from collections import defaultdict
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Max, Q
+
+
+def backfill_direct_pairs(apps, schema_editor):
+    """
+    Key every two-member conversation by its participant pair, merging
+    duplicate conversations of the same pair into the oldest one.
+    """
+    Conversation = apps.get_model('messaging', 'Conversation')
+    ConversationMember = apps.get_model('messaging', 'ConversationMember')
+    Message = apps.get_model('messaging', 'Message')
+
+    members = defaultdict(list)
+    for conversation_id, user_id in ConversationMember.objects.values_list('conversation_id', 'user_id').iterator():
+        members[conversation_id].append(user_id)
+
+    by_pair = defaultdict(list)
+    for conversation_id, user_ids in members.items():
+        if len(user_ids) == 2:
+            by_pair[tuple(sorted(user_ids))].append(conversation_id)
+
+    for (low, high), conversation_ids in by_pair.items():
+        keep, *duplicates = sorted(conversation_ids)
+        if duplicates:
+            Message.objects.filter(conversation_id__in=duplicates).update(conversation_id=keep)
+            updated_at = Conversation.objects.filter(id__in=conversation_ids).aggregate(latest=Max('updated_at'))['latest']
+            Conversation.objects.filter(id__in=duplicates).delete()
+
+            # Rebuild the merged conversation's inbox summary
+            last_message = Message.objects.filter(conversation_id=keep).order_by('-created_at', '-id').first()
+            Conversation.objects.filter(id=keep).update(last_message=last_message, updated_at=updated_at)
+            for user_id in (low, high):
+                unread = Message.objects.filter(conversation_id=keep, is_read=False).filter(~Q(sender_id=user_id)).count()
+                ConversationMember.objects.filter(conversation_id=keep, user_id=user_id).update(unread_count=unread)
+
+        Conversation.objects.filter(id=keep).update(direct_user_low_id=low, direct_user_high_id=high)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messaging', '0003_conversation_member'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='conversation',
+            name='direct_user_high',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='conversation',
+            name='direct_user_low',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(backfill_direct_pairs, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='conversation',
+            constraint=models.UniqueConstraint(fields=('direct_user_low', 'direct_user_high'), name='conversation_direct_pair_uniq'),
+        ),
+    ]
@@ -1,14 +1,113 @@
-from django.db import models
+from collections import defaultdict
+
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
 from django.conf import settings
 
 class Conversation(models.Model):
     """Chat conversations"""
-    participants = models.ManyToManyField(settings.AUTH_USER_MODEL, related_name='conversations')
+    participants = models.ManyToManyField(settings.AUTH_USER_MODEL, related_name='conversations',
+                                          through='ConversationMember')
+    last_message = models.ForeignKey('Message', on_delete=models.SET_NULL, null=True, blank=True,
+                                     related_name='+')
+    # Canonical (lower ID, higher ID) participant pair of a 1:1 conversation
+    direct_user_low = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True,
+                                        blank=True, related_name='+', db_index=False)
+    direct_user_high = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True,
+                                         blank=True, related_name='+', db_index=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['-updated_at']
+        constraints = [
+            models.UniqueConstraint(fields=['direct_user_low', 'direct_user_high'],
+                                    name='conversation_direct_pair_uniq'),
+        ]
+
+    @classmethod
+    def get_or_create_direct(cls, user, other):
+        """
+        The 1:1 conversation between two users, created if missing.
+
+        One lookup on the unique pair index; when two requests race to
+        create it, the loser's insert fails and it returns the winner's.
+        """
+        low, high = sorted((user.pk, other.pk))
+        lookup = {'direct_user_low_id': low, 'direct_user_high_id': high}
+        conversation = cls.objects.filter(**lookup).first()
+        if conversation:
+            return conversation, False
+        try:
+            with transaction.atomic():
+                conversation = cls.objects.create(**lookup)
+                conversation.participants.add(low, high)
+            return conversation, True
+        except IntegrityError:
+            return cls.objects.get(**lookup), False
+
+    def record_message(self, message):
+        """
+        Update the denormalized inbox state for a newly saved ``message``:
+        the conversation's last message and activity time, and every other
+        member's unread count. Call it in the transaction that saved the
+        message, so it serializes with mark-as-read on the member rows.
+        """
+        Conversation.record_messages([message])
+        self.last_message = message
+        self.updated_at = message.created_at
+
+    @classmethod
+    def record_messages(cls, messages):
+        """record_message() for a batch of saved messages across conversations"""
+        latest = {}
+        for message in messages:
+            current = latest.get(message.conversation_id)
+            if current is None or (message.created_at, message.pk) > (current.created_at, current.pk):
+                latest[message.conversation_id] = message
+
+        with transaction.atomic():
+            for conversation_id, message in latest.items():
+                cls.objects.filter(pk=conversation_id).update(last_message=message, updated_at=message.created_at)
+
+            senders = defaultdict(list)
+            for message in messages:
+                senders[message.conversation_id].append(message.sender_id)
+
+            # Members are grouped by how many of the batch they haven't read,
+            # giving one UPDATE per distinct increment
+            members_by_increment = defaultdict(list)
+            members = ConversationMember.objects.filter(conversation_id__in=list(latest)).values_list(
+                'pk', 'conversation_id', 'user_id'
+            )
+            for member_id, conversation_id, user_id in members:
+                unread = sum(1 for sender_id in senders[conversation_id] if sender_id != user_id)
+                if unread:
+                    members_by_increment[unread].append(member_id)
+            for unread, member_ids in members_by_increment.items():
+                ConversationMember.objects.filter(pk__in=member_ids).update(unread_count=F('unread_count') + unread)
+
+    def mark_read(self, user):
+        """Mark every message from the other participants as read by ``user``"""
+        with transaction.atomic():
+            # Lock the member row first so a concurrent record_message()
+            # can't count a message this update has already marked read
+            list(ConversationMember.objects.select_for_update().filter(conversation_id=self.pk, user=user))
+            self.messages.filter(is_read=False).exclude(sender=user).update(is_read=True)
+            ConversationMember.objects.filter(conversation_id=self.pk, user=user).update(unread_count=0)
+
+
+class ConversationMember(models.Model):
+    """A participant of a conversation, with their unread message count"""
+    conversation = models.ForeignKey(Conversation, on_delete=models.CASCADE, related_name='members')
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE,
+                             related_name='conversation_memberships')
+    unread_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        # The table Django created for the former auto-generated M2M
+        db_table = 'messaging_conversation_participants'
+        unique_together = ('conversation', 'user')
 
 
 class Message(models.Model):
@@ -20,4 +119,9 @@ class Message(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
-        ordering = ['created_at']
\ No newline at end of file
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['conversation', 'created_at'], name='msg_conversation_created_idx'),
+            models.Index(fields=['conversation', 'sender'], condition=models.Q(is_read=False),
+                         name='msg_unread_idx'),
+        ]
\ No newline at end of file
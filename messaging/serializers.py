@@ -1,36 +1,39 @@
 from rest_framework import serializers
 from .models import Conversation, Message
-from accounts.serializers import UserSerializer
+from accounts.serializers import UserSerializer, UserSummarySerializer
+from rocials_backend.sparse_fields import SparseFieldsetMixin
 
-class MessageSerializer(serializers.ModelSerializer):
+class MessageSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for Message model"""
-    sender = UserSerializer(read_only=True)
+    sender = UserSummarySerializer(read_only=True)
     
     class Meta:
         model = Message
         fields = ['id', 'conversation', 'sender', 'content', 'is_read', 'created_at']
         read_only_fields = ['id', 'sender', 'created_at']
 
+    expandable_fields = {'sender': UserSerializer}
 
-class ConversationSerializer(serializers.ModelSerializer):
+
+class ConversationSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for Conversation model"""
-    participants = UserSerializer(many=True, read_only=True)
-    last_message = serializers.SerializerMethodField()
+    participants = UserSummarySerializer(many=True, read_only=True)
+    last_message = MessageSerializer(read_only=True)
     unread_count = serializers.SerializerMethodField()
     
     class Meta:
         model = Conversation
         fields = ['id', 'participants', 'last_message', 'unread_count', 'created_at', 'updated_at']
         read_only_fields = ['id', 'created_at', 'updated_at']
-    
-    def get_last_message(self, obj):
-        last_message = obj.messages.last()
-        if last_message:
-            return MessageSerializer(last_message).data
-        return None
+
+    expandable_fields = {'participants': UserSerializer}
     
     def get_unread_count(self, obj):
+        # Annotated by ConversationListView from the viewer's member row
+        if hasattr(obj, 'unread_count'):
+            return obj.unread_count
         request = self.context.get('request')
         if request and request.user.is_authenticated:
-            return obj.messages.filter(is_read=False).exclude(sender=request.user).count()
+            member = obj.members.filter(user=request.user).values_list('unread_count', flat=True).first()
+            return member or 0
         return 0
\ No newline at end of file
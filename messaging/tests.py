@@ -1,3 +1,200 @@
-from django.test import TestCase
+import json
 
-# Create your tests here.
+from channels.db import database_sync_to_async
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils.dateparse import parse_datetime
+from rest_framework.test import APIClient
+
+from rocials_backend.query_plans import QueryPlanAssertions
+from .models import Conversation, ConversationMember, Message
+from .routing import websocket_urlpatterns
+
+User = get_user_model()
+
+
+class MessagingQueryPlanTests(QueryPlanAssertions, TestCase):
+    """Hot messaging queries must be index reads, not full table scans"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.alice = User.objects.create_user('alice', 'alice@example.com', 'password123')
+        cls.bob = User.objects.create_user('bob', 'bob@example.com', 'password123')
+        cls.conversation = Conversation.objects.create()
+        cls.conversation.participants.add(cls.alice, cls.bob)
+        for i in range(30):
+            Message.objects.create(conversation=cls.conversation, sender=cls.bob if i % 2 else cls.alice,
+                                   content=f'message {i}', is_read=i < 20)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.alice)
+
+    def test_messages(self):
+        self.assertNoFullScans(
+            lambda: self.client.get(f'/api/messaging/conversations/{self.conversation.id}/messages/'),
+            ['messaging_message'],
+        )
+
+    def test_conversation_list(self):
+        self.assertNoFullScans(lambda: self.client.get('/api/messaging/conversations/'), ['messaging_message'])
+
+
+class ChatConsumerTests(TransactionTestCase):
+    """Websocket chat: membership on connect, acks and per-message failures"""
+
+    def setUp(self):
+        self.alice = User.objects.create_user('alice', 'alice@example.com', 'password123')
+        self.bob = User.objects.create_user('bob', 'bob@example.com', 'password123')
+        self.carol = User.objects.create_user('carol', 'carol@example.com', 'password123')
+        self.conversation, _ = Conversation.get_or_create_direct(self.alice, self.bob)
+        self.application = URLRouter(websocket_urlpatterns)
+
+    def communicator(self, user, conversation):
+        communicator = WebsocketCommunicator(self.application, f'/ws/chat/{conversation.id}/')
+        communicator.scope['user'] = user
+        return communicator
+
+    async def test_rejects_anonymous_and_non_members(self):
+        for user in (AnonymousUser(), self.carol):
+            connected, _ = await self.communicator(user, self.conversation).connect()
+            self.assertFalse(connected)
+
+    async def test_sender_gets_ack_with_saved_id(self):
+        alice, bob = self.communicator(self.alice, self.conversation), self.communicator(self.bob, self.conversation)
+        self.assertTrue((await alice.connect())[0])
+        self.assertTrue((await bob.connect())[0])
+
+        await alice.send_to(text_data=json.dumps({'message': 'hi', 'client_id': 'c1'}))
+        ack = json.loads(await alice.receive_from())
+        broadcast = json.loads(await bob.receive_from())
+        await alice.disconnect()
+        await bob.disconnect()
+
+        message = await database_sync_to_async(Message.objects.get)()
+        self.assertEqual(ack['type'], 'message_ack')
+        self.assertEqual(ack['client_id'], 'c1')
+        self.assertEqual(ack['id'], message.id)
+        self.assertEqual(parse_datetime(ack['created_at']), message.created_at)
+        self.assertEqual(broadcast['id'], message.id)
+        self.assertEqual(broadcast['message'], 'hi')
+        member = await database_sync_to_async(ConversationMember.objects.get)(conversation=self.conversation, user=self.bob)
+        self.assertEqual(member.unread_count, 1)
+
+    @override_settings(CHAT_WRITE_BUFFER_DELAY=0.2)
+    async def test_failing_message_does_not_fail_its_batch(self):
+        doomed, _ = await database_sync_to_async(Conversation.get_or_create_direct)(self.alice, self.carol)
+        healthy, broken = self.communicator(self.alice, self.conversation), self.communicator(self.alice, doomed)
+        self.assertTrue((await healthy.connect())[0])
+        self.assertTrue((await broken.connect())[0])
+        # Deleted while its socket is open, so its message fails the FK
+        await database_sync_to_async(doomed.delete)()
+
+        # Both land in the same batch within the buffer delay
+        await healthy.send_to(text_data=json.dumps({'message': 'kept', 'client_id': 1}))
+        await broken.send_to(text_data=json.dumps({'message': 'lost', 'client_id': 2}))
+        ack = json.loads(await healthy.receive_from(timeout=5))
+        error = json.loads(await broken.receive_from(timeout=5))
+        await healthy.disconnect()
+        await broken.disconnect()
+
+        self.assertEqual(ack['type'], 'message_ack')
+        self.assertEqual(error, {'type': 'message_error', 'client_id': 2, 'error': 'Message could not be saved'})
+        contents = await database_sync_to_async(list)(Message.objects.values_list('content', flat=True))
+        self.assertEqual(contents, ['kept'])
+
+
+class DirectConversationTests(TestCase):
+    """One conversation per pair of users, whoever starts it"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.alice = User.objects.create_user('alice', 'alice@example.com', 'password123')
+        cls.bob = User.objects.create_user('bob', 'bob@example.com', 'password123')
+
+    def test_get_or_create_direct_is_order_independent(self):
+        conversation, created = Conversation.get_or_create_direct(self.alice, self.bob)
+        self.assertTrue(created)
+        self.assertEqual(Conversation.get_or_create_direct(self.bob, self.alice), (conversation, False))
+        self.assertEqual(
+            set(conversation.participants.values_list('id', flat=True)), {self.alice.id, self.bob.id}
+        )
+
+    def test_create_endpoint_returns_existing_conversation(self):
+        client = APIClient()
+        client.force_authenticate(self.alice)
+        first = client.post('/api/messaging/conversations/create/', {'username': 'bob'})
+        client.force_authenticate(self.bob)
+        second = client.post('/api/messaging/conversations/create/', {'username': 'alice'})
+        self.assertEqual((first.status_code, second.status_code), (201, 200))
+        self.assertEqual(first.data['id'], second.data['id'])
+        self.assertEqual(Conversation.objects.count(), 1)
+
+
+class DirectPairMigrationTests(TransactionTestCase):
+    """Migration 0004 merges duplicate conversations of a pair and rebuilds their summaries"""
+
+    migrate_from = [('messaging', '0003_conversation_member')]
+    migrate_to = [('messaging', '0004_direct_conversation_pair')]
+
+    def setUp(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.migrate_from)
+        apps = executor.loader.project_state(self.migrate_from).apps
+        Conversation = apps.get_model('messaging', 'Conversation')
+        ConversationMember = apps.get_model('messaging', 'ConversationMember')
+        Message = apps.get_model('messaging', 'Message')
+
+        # Only messaging is rolled back; the users table is current
+        alice, bob, carol = (
+            User.objects.create_user(name, f'{name}@example.com', 'password123').id for name in ('alice', 'bob', 'carol')
+        )
+        self.alice_id, self.bob_id, self.carol_id = alice, bob, carol
+
+        def conversation(*user_ids):
+            conversation = Conversation.objects.create()
+            for user_id in user_ids:
+                ConversationMember.objects.create(conversation=conversation, user_id=user_id)
+            return conversation
+
+        self.kept = conversation(alice, bob)
+        duplicate = conversation(bob, alice)
+        self.other = conversation(alice, carol)
+        self.group = conversation(alice, bob, carol)
+        Message.objects.create(conversation=self.kept, sender_id=alice, content='one', is_read=True)
+        Message.objects.create(conversation=duplicate, sender_id=alice, content='two')
+        Message.objects.create(conversation=duplicate, sender_id=bob, content='three')
+        self.latest = Message.objects.create(conversation=duplicate, sender_id=alice, content='four')
+        self.duplicate_id = duplicate.id
+
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.migrate_to)
+        self.apps = executor.loader.project_state(self.migrate_to).apps
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_duplicates_are_merged_and_summaries_rebuilt(self):
+        Conversation = self.apps.get_model('messaging', 'Conversation')
+        ConversationMember = self.apps.get_model('messaging', 'ConversationMember')
+        Message = self.apps.get_model('messaging', 'Message')
+
+        self.assertFalse(Conversation.objects.filter(id=self.duplicate_id).exists())
+        kept = Conversation.objects.get(id=self.kept.id)
+        self.assertEqual((kept.direct_user_low_id, kept.direct_user_high_id), (self.alice_id, self.bob_id))
+        self.assertEqual(kept.last_message_id, self.latest.id)
+        self.assertEqual(Message.objects.filter(conversation=kept).count(), 4)
+
+        unread = dict(ConversationMember.objects.filter(conversation=kept).values_list('user_id', 'unread_count'))
+        self.assertEqual(unread, {self.alice_id: 1, self.bob_id: 2})
+
+        other = Conversation.objects.get(id=self.other.id)
+        self.assertEqual((other.direct_user_low_id, other.direct_user_high_id), (self.alice_id, self.carol_id))
+        group = Conversation.objects.get(id=self.group.id)
+        self.assertIsNone(group.direct_user_low_id)
@@ -3,6 +3,8 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F
 from .models import Conversation, Message
 from .serializers import ConversationSerializer, MessageSerializer
 
@@ -15,9 +17,15 @@ class ConversationListView(generics.ListAPIView):
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
-        return Conversation.objects.filter(
-            participants=self.request.user
-        ).prefetch_related('participants')
+        # One join from the viewer's member rows to the denormalized
+        # summaries, newest activity first
+        return (
+            Conversation.objects.filter(members__user=self.request.user)
+            .annotate(unread_count=F('members__unread_count'))
+            .select_related('last_message__sender')
+            .prefetch_related('participants')
+            .order_by('-updated_at')
+        )
 
 
 @api_view(['POST'])
@@ -37,21 +45,9 @@ def create_conversation(request):
     if other_user == request.user:
         return Response({'error': 'Cannot chat with yourself'}, status=status.HTTP_400_BAD_REQUEST)
     
-    # Check if conversation exists
-    existing = Conversation.objects.filter(
-        participants=request.user
-    ).filter(participants=other_user).first()
-    
-    if existing:
-        serializer = ConversationSerializer(existing)
-        return Response(serializer.data)
-    
-    # Create new conversation
-    conversation = Conversation.objects.create()
-    conversation.participants.add(request.user, other_user)
-    
-    serializer = ConversationSerializer(conversation)
-    return Response(serializer.data, status=status.HTTP_201_CREATED)
+    conversation, created = Conversation.get_or_create_direct(request.user, other_user)
+    serializer = ConversationSerializer(conversation, context={'request': request})
+    return Response(serializer.data, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
 
 
 class MessageListCreateView(generics.ListCreateAPIView):
@@ -81,7 +77,9 @@ class MessageListCreateView(generics.ListCreateAPIView):
         if not conversation:
             return Response({'error': 'Conversation not found'}, status=status.HTTP_404_NOT_FOUND)
         
-        serializer.save(sender=self.request.user, conversation=conversation)
+        with transaction.atomic():
+            message = serializer.save(sender=self.request.user, conversation=conversation)
+            conversation.record_message(message)
 
 
 @api_view(['POST'])
@@ -96,9 +94,6 @@ def mark_messages_read(request, conversation_id):
     if not conversation:
         return Response({'error': 'Conversation not found'}, status=status.HTTP_404_NOT_FOUND)
     
-    Message.objects.filter(
-        conversation=conversation,
-        is_read=False
-    ).exclude(sender=request.user).update(is_read=True)
+    conversation.mark_read(request.user)
     
     return Response({'message': 'Messages marked as read'})
\ No newline at end of file
@@ -0,0 +1,107 @@
+import asyncio
+import weakref
+
+from channels.db import database_sync_to_async
+from django.conf import settings
+from django.db import DatabaseError, transaction
+
+from .models import Conversation, Message
+
+
+class MessageWriteBuffer:
+    """
+    Group commit for chat messages.
+
+    Consumers await write() and the buffer persists everything queued
+    across connections in one bulk_create once CHAT_WRITE_BUFFER_SIZE
+    messages are waiting or CHAT_WRITE_BUFFER_DELAY seconds have passed,
+    whichever comes first. Flushes run one at a time and save at most
+    CHAT_WRITE_BUFFER_SIZE messages each, in arrival order.
+    """
+
+    def __init__(self):
+        self._pending = []
+        self._flush_lock = asyncio.Lock()
+        self._timer = None
+
+    async def write(self, conversation_id, sender_id, content):
+        """
+        Queue a message and return it once saved (with its ``id`` and
+        ``created_at``). Raises DatabaseError if this message can't be saved.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((Message(conversation_id=conversation_id, sender_id=sender_id, content=content), future))
+        if len(self._pending) >= settings.CHAT_WRITE_BUFFER_SIZE:
+            self._cancel_timer()
+            asyncio.ensure_future(self.flush())
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                settings.CHAT_WRITE_BUFFER_DELAY, lambda: asyncio.ensure_future(self.flush())
+            )
+        return await future
+
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    async def flush(self):
+        async with self._flush_lock:
+            self._cancel_timer()
+            size = settings.CHAT_WRITE_BUFFER_SIZE
+            batch, self._pending = self._pending[:size], self._pending[size:]
+            if not batch:
+                return
+            if self._pending:
+                # Whatever is left over goes out as soon as this batch commits
+                asyncio.ensure_future(self.flush())
+            messages = [message for message, _ in batch]
+            try:
+                try:
+                    await database_sync_to_async(self._save)(messages)
+                    errors = [None] * len(batch)
+                except DatabaseError:
+                    # e.g. a conversation deleted while its socket was open;
+                    # retry one by one so only the bad messages fail
+                    errors = await database_sync_to_async(self._save_each)(messages)
+            except Exception as exc:
+                errors = [exc] * len(batch)
+            for (message, future), error in zip(batch, errors):
+                if future.done():
+                    continue
+                if error is None:
+                    future.set_result(message)
+                else:
+                    future.set_exception(error)
+
+    @staticmethod
+    def _save(messages):
+        with transaction.atomic():
+            Message.objects.bulk_create(messages)
+            Conversation.record_messages(messages)
+
+    @classmethod
+    def _save_each(cls, messages):
+        """Save ``messages`` separately; returns the error of each, or None"""
+        errors = []
+        for message in messages:
+            # The failed batch may have assigned a primary key before rolling back
+            message.pk = None
+            try:
+                cls._save([message])
+            except DatabaseError as exc:
+                errors.append(exc)
+            else:
+                errors.append(None)
+        return errors
+
+
+_buffers = weakref.WeakKeyDictionary()
+
+
+def get_buffer():
+    """The write buffer of the running event loop"""
+    loop = asyncio.get_running_loop()
+    if loop not in _buffers:
+        _buffers[loop] = MessageWriteBuffer()
+    return _buffers[loop]
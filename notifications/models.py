@@ -20,4 +20,9 @@ class Notification(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
-        ordering = ['-created_at']
\ No newline at end of file
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['recipient', '-created_at'], name='notif_recipient_created_idx'),
+            models.Index(fields=['recipient', '-created_at'], condition=models.Q(is_read=False),
+                         name='notif_unread_idx'),
+        ]
\ No newline at end of file
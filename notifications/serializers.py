@@ -1,13 +1,16 @@
 from rest_framework import serializers
 from .models import Notification
-from accounts.serializers import UserSerializer
+from accounts.serializers import UserSerializer, UserSummarySerializer
+from rocials_backend.sparse_fields import SparseFieldsetMixin
 
-class NotificationSerializer(serializers.ModelSerializer):
+class NotificationSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for Notification model"""
-    sender = UserSerializer(read_only=True)
+    sender = UserSummarySerializer(read_only=True)
     
     class Meta:
         model = Notification
         fields = ['id', 'sender', 'notification_type', 'content', 'link', 
                   'is_read', 'created_at']
-        read_only_fields = ['id', 'sender', 'created_at']
\ No newline at end of file
+        read_only_fields = ['id', 'sender', 'created_at']
+
+    expandable_fields = {'sender': UserSerializer}
\ No newline at end of file
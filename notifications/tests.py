@@ -1,3 +1,31 @@
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from rocials_backend.query_plans import QueryPlanAssertions
+from .models import Notification
+
+User = get_user_model()
+
+
+class NotificationQueryPlanTests(QueryPlanAssertions, TestCase):
+    """Hot notification queries must be index reads, not full table scans"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.alice = User.objects.create_user('alice', 'alice@example.com', 'password123')
+        cls.bob = User.objects.create_user('bob', 'bob@example.com', 'password123')
+        for i in range(30):
+            Notification.objects.create(recipient=cls.alice if i % 2 else cls.bob, sender=cls.bob,
+                                        notification_type='like', content=f'like {i}', is_read=i % 3 == 0)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.alice)
+
+    def test_list(self):
+        self.assertNoFullScans(lambda: self.client.get('/api/notifications/'), ['notifications_notification'])
+
+    def test_unread_count(self):
+        self.assertNoFullScans(lambda: self.client.get('/api/notifications/unread-count/'),
+                               ['notifications_notification'])
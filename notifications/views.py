@@ -4,12 +4,14 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from .models import Notification
 from .serializers import NotificationSerializer
+from rocials_backend.pagination import CreatedAtCursorPagination
 
 
 class NotificationListView(generics.ListAPIView):
     """Get all notifications for current user"""
     serializer_class = NotificationSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = CreatedAtCursorPagination
     
     def get_queryset(self):
         return Notification.objects.filter(recipient=self.request.user)
@@ -0,0 +1,42 @@
+import random
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .models import Post
+
+POOL_CACHE_KEY = 'posts:explore_pool'
+PAGE_SIZE = 30
+
+
+def refresh_pool():
+    """Snapshot the IDs of the most engaging public posts"""
+    post_ids = list(
+        Post.objects.filter(is_exclusive=False)
+        .order_by('-likes_count', '-id')
+        .values_list('id', flat=True)[:settings.EXPLORE_POOL_SIZE]
+    )
+    cache.set(POOL_CACHE_KEY, post_ids, settings.EXPLORE_POOL_TTL)
+    return post_ids
+
+
+def get_pool():
+    post_ids = cache.get(POOL_CACHE_KEY)
+    if post_ids is None:
+        post_ids = refresh_pool()
+    return post_ids
+
+
+def default_seed(user):
+    """One shuffle per viewer per day, so paging doesn't repeat posts"""
+    viewer = user.id if user.is_authenticated else 'anon'
+    return f'{viewer}:{timezone.now().date().isoformat()}'
+
+
+def sample_page(seed, page, page_size=PAGE_SIZE):
+    """Return one page of post IDs from the pool shuffled by ``seed``"""
+    pool = list(get_pool())
+    random.Random(seed).shuffle(pool)
+    start = (page - 1) * page_size
+    return pool[start:start + page_size]
@@ -0,0 +1,191 @@
+import base64
+import binascii
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from accounts import follow_graph
+from accounts.models import User
+
+from .models import Post, FeedEntry
+
+CELEBRITIES_KEY = 'feed:celebrities'
+
+
+def _is_celebrity(user):
+    """Authors above the threshold are merged on read instead of fanned out"""
+    return user.followers_count >= settings.FEED_FANOUT_MAX_FOLLOWERS
+
+
+def celebrity_ids():
+    """Sorted IDs of every author above the fan-out threshold, cached briefly"""
+    ids = cache.get(CELEBRITIES_KEY)
+    if ids is None:
+        ids = list(
+            User.objects.filter(followers_count__gte=settings.FEED_FANOUT_MAX_FOLLOWERS)
+            .order_by('id')
+            .values_list('id', flat=True)
+        )
+        cache.set(CELEBRITIES_KEY, ids, settings.FEED_CELEBRITIES_CACHE_TIMEOUT)
+    return ids
+
+
+def fan_out_post(post):
+    """Deliver a new post to its author's and followers' inboxes"""
+    author = post.author
+    recipient_ids = [author.id]
+    if not _is_celebrity(author):
+        recipient_ids += list(author.followers.values_list('follower_id', flat=True))
+
+    batch_size = settings.FEED_FANOUT_BATCH_SIZE
+    for start in range(0, len(recipient_ids), batch_size):
+        FeedEntry.objects.bulk_create(
+            [
+                FeedEntry(user_id=user_id, post=post, created_at=post.created_at)
+                for user_id in recipient_ids[start:start + batch_size]
+            ],
+            ignore_conflicts=True,
+        )
+
+
+def _copy_recent_posts(user, author):
+    recent = Post.objects.filter(author=author).order_by('-created_at').values_list('id', 'created_at')
+    FeedEntry.objects.bulk_create(
+        [
+            FeedEntry(user=user, post_id=post_id, created_at=created_at)
+            for post_id, created_at in recent[:settings.FEED_BACKFILL_LIMIT]
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def trim_inbox(user_id):
+    """Drop entries beyond the newest FEED_INBOX_SIZE of a user's inbox"""
+    cutoff = (
+        FeedEntry.objects.filter(user_id=user_id)
+        .order_by('-created_at', '-post_id')
+        .values_list('created_at', 'post_id')[settings.FEED_INBOX_SIZE:settings.FEED_INBOX_SIZE + 1]
+        .first()
+    )
+    if cutoff is None:
+        return 0
+    created_at, post_id = cutoff
+    older = FeedEntry.objects.filter(user_id=user_id, created_at__lte=created_at).exclude(
+        created_at=created_at, post_id__gt=post_id
+    )
+    return older.delete()[0]
+
+
+def backfill_author(user, author):
+    """Copy an author's recent posts into a new follower's inbox"""
+    if not _is_celebrity(author):
+        _copy_recent_posts(user, author)
+        trim_inbox(user.id)
+
+
+def prune_author(user, author):
+    """Remove an unfollowed author's posts from the user's inbox"""
+    FeedEntry.objects.filter(user=user, post__author=author).delete()
+
+
+def rebuild_feed(user):
+    """Rebuild a user's inbox from their own and followed authors' posts"""
+    FeedEntry.objects.filter(user=user).delete()
+    _copy_recent_posts(user, user)
+    for follow in user.following.select_related('following'):
+        backfill_author(user, follow.following)
+
+
+def home_feed_page(user, position=None, page_size=20):
+    """
+    One page of the user's home feed, newest first.
+
+    ``position`` is the ``(created_at, post id)`` of the last post of the
+    previous page. The inbox is read with a range scan of
+    (user, -created_at, -post) and each followed celebrity, whose posts are
+    never fanned out on write, with a range scan of (author, -created_at);
+    every source stops one row past the page. Returns the page's posts and
+    the position of the next page, or None on the last page.
+    """
+    entries = FeedEntry.objects.filter(user=user).select_related('post__author').order_by('-created_at', '-post_id')
+    if position:
+        created_at, post_id = position
+        entries = entries.filter(created_at__lte=created_at).exclude(created_at=created_at, post_id__gte=post_id)
+    posts = [entry.post for entry in entries[:page_size + 1]]
+
+    following = follow_graph.following_ids(user.id)
+    for author_id in celebrity_ids():
+        if not follow_graph.contains(following, author_id):
+            continue
+        recent = Post.objects.filter(author_id=author_id).select_related('author').order_by('-created_at', '-id')
+        if position:
+            recent = recent.filter(created_at__lte=created_at).exclude(created_at=created_at, id__gte=post_id)
+        posts += recent[:page_size + 1]
+
+    # A post can be in both sources if its author crossed the threshold
+    merged = sorted({post.id: post for post in posts}.values(), key=lambda post: (post.created_at, post.id), reverse=True)
+    page = merged[:page_size]
+    next_position = (page[-1].created_at, page[-1].id) if len(merged) > page_size else None
+    return page, next_position
+
+
+class HomeFeedPagination(BasePagination):
+    """
+    Forward-only cursor pagination for home_feed_page().
+
+    Responses keep the ``next`` / ``previous`` / ``results`` shape of
+    CreatedAtCursorPagination; ``previous`` is always null.
+    """
+    page_size = 20
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_feed(self, request):
+        self.request = request
+        posts, self.next_position = home_feed_page(request.user, self.decode_cursor(request), self.page_size)
+        return posts
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            created_at, post_id = base64.urlsafe_b64decode(encoded.encode('ascii')).decode('ascii').rsplit('|', 1)
+            position = (parse_datetime(created_at), int(post_id))
+        except (TypeError, ValueError, UnicodeError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+        if position[0] is None:
+            raise NotFound(self.invalid_cursor_message)
+        return position
+
+    def encode_cursor(self, position):
+        created_at, post_id = position
+        encoded = base64.urlsafe_b64encode(f'{created_at.isoformat()}|{post_id}'.encode('ascii')).decode('ascii')
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        return self.encode_cursor(self.next_position)
+
+    def get_paginated_response(self, data):
+        return Response({'next': self.get_next_link(), 'previous': None, 'results': data})
+
+    def get_results(self, data):
+        return data['results']
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
@@ -0,0 +1,70 @@
+import time
+from unittest import mock
+
+from cloudinary import CloudinaryResource
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import RequestFactory
+
+from posts.models import Post
+from posts.serializers import PostSerializer
+from rocials_backend.media import _cloudinary_url, media_url
+
+User = get_user_model()
+
+
+def image(public_id, format='jpg'):
+    return CloudinaryResource(public_id, format=format, version=1700000000, resource_type='image')
+
+
+def sdk_url(resource, **options):
+    """The uncached ``resource.url`` the serializers used before media_url"""
+    if not resource:
+        return None
+    return resource.build_url(**{**getattr(resource, 'url_options', {}), **options})
+
+
+class Command(BaseCommand):
+    help = 'Benchmark PostSerializer(many=True) on a feed page: SDK URLs vs memoized media_url'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pages', type=int, default=500)
+        parser.add_argument('--authors', type=int, default=5, help='Distinct authors per 20-post page')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            # A feed page: 20 posts (media + thumbnail) by a few repeated
+            # authors (avatar)
+            authors = [
+                User.objects.create_user(
+                    f'bench_media_{i}', f'bench_media_{i}@example.com', None,
+                    profile_picture=image(f'avatars/user_{i}', 'png'),
+                )
+                for i in range(options['authors'])
+            ]
+            Post.objects.bulk_create([
+                Post(
+                    author=authors[i % len(authors)], content=f'post {i}', post_type='image',
+                    media_file=image(f'posts/media_{i}'),
+                    thumbnail=image(f'thumbnails/thumb_{i}'),
+                )
+                for i in range(20)
+            ])
+            page = list(Post.objects.filter(author__in=authors).select_related('author'))
+            request = RequestFactory().get('/api/posts/')
+            request.user = authors[0]
+
+            for name, build in (('sdk .url', sdk_url), ('media_url', media_url)):
+                _cloudinary_url.cache_clear()
+                with mock.patch('posts.serializers.media_url', build), \
+                        mock.patch('accounts.serializers.media_url', build):
+                    start = time.perf_counter()
+                    for _ in range(options['pages']):
+                        PostSerializer(page, many=True, context={'request': request}).data
+                    elapsed = time.perf_counter() - start
+                self.stdout.write(
+                    f'{name:>10}: {options["pages"] / elapsed:8.0f} pages/s '
+                    f'({elapsed / options["pages"] * 1e3:.2f} ms/page)'
+                )
+            transaction.set_rollback(True)
@@ -0,0 +1,58 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from posts.models import Post
+from posts.search import search_posts
+
+User = get_user_model()
+
+WORDS = (
+    'sunset travel coffee music launch studio workout recipe beach city night art '
+    'design photo video live update morning weekend project friends family game '
+    'release behind scenes tutorial review podcast crypto fashion street food'
+).split()
+
+
+class Command(BaseCommand):
+    help = 'Benchmark post search on a synthetic dataset (rolled back afterwards)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=1_000_000)
+        parser.add_argument('--queries', type=int, default=200)
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        rng = random.Random(42)
+        with transaction.atomic():
+            author = User.objects.create_user(username='bench_search', email='bench_search@example.com')
+            start = time.perf_counter()
+            remaining = options['posts']
+            while remaining:
+                batch = min(remaining, options['batch_size'])
+                Post.objects.bulk_create([
+                    Post(author=author, post_type='text', content=' '.join(rng.choices(WORDS, k=12)),
+                         is_exclusive=rng.random() < 0.1)
+                    for _ in range(batch)
+                ])
+                remaining -= batch
+            self.stdout.write(f'Seeded {options["posts"]} posts in {time.perf_counter() - start:.1f}s')
+
+            timings = []
+            for _ in range(options['queries']):
+                query = ' '.join(rng.sample(WORDS, k=rng.choice((1, 2))))
+                start = time.perf_counter()
+                list(search_posts(query, AnonymousUser()).order_by('-rank', '-id')[:20])
+                timings.append((time.perf_counter() - start) * 1000)
+
+            timings.sort()
+            self.stdout.write(
+                f'{options["queries"]} searches: p50 {statistics.median(timings):.1f} ms, '
+                f'p99 {timings[int(len(timings) * 0.99) - 1]:.1f} ms, max {timings[-1]:.1f} ms'
+            )
+            transaction.set_rollback(True)
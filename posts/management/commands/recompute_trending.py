@@ -0,0 +1,33 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from posts.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Recompute Post.trending_score (run periodically, e.g. from cron)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=7, help='Only posts created in the last N days (0 = all)')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        posts = Post.objects.only(
+            'id', 'likes_count', 'comments_count', 'shares_count', 'views_count', 'created_at', 'trending_score'
+        ).order_by('id')
+        if options['days']:
+            posts = posts.filter(created_at__gte=timezone.now() - timedelta(days=options['days']))
+
+        batch, updated = [], 0
+        for post in posts.iterator(chunk_size=options['batch_size']):
+            post.trending_score = post.compute_trending_score()
+            batch.append(post)
+            if len(batch) >= options['batch_size']:
+                updated += Post.objects.bulk_update(batch, ['trending_score'])
+                batch = []
+        if batch:
+            updated += Post.objects.bulk_update(batch, ['trending_score'])
+
+        self.stdout.write(self.style.SUCCESS(f'Updated {updated} trending score(s)'))
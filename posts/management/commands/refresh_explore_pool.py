@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from posts.explore import refresh_pool
+
+
+class Command(BaseCommand):
+    help = 'Refresh the candidate pool sampled by the explore endpoint'
+
+    def handle(self, *args, **options):
+        post_ids = refresh_pool()
+        self.stdout.write(self.style.SUCCESS(f'Explore pool refreshed with {len(post_ids)} post(s)'))
@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+from posts.feed import trim_inbox
+from posts.models import FeedEntry
+
+
+class Command(BaseCommand):
+    help = 'Trim materialized home feeds to their newest FEED_INBOX_SIZE entries'
+
+    def handle(self, *args, **options):
+        oversized = (
+            FeedEntry.objects.order_by().values('user_id')
+            .annotate(entries=Count('id'))
+            .filter(entries__gt=settings.FEED_INBOX_SIZE)
+            .values_list('user_id', flat=True)
+        )
+        users = deleted = 0
+        for user_id in list(oversized):
+            deleted += trim_inbox(user_id)
+            users += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Trimmed {deleted} entries from {users} feed(s)'))
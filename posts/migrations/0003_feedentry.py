@@ -0,0 +1,49 @@
+# Generated by Django 6.0.2 on 2026-10-17 01:15
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_feeds(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    FeedEntry = apps.get_model('posts', 'FeedEntry')
+    Follow = apps.get_model('accounts', 'Follow')
+
+    for post in Post.objects.select_related('author').iterator():
+        recipient_ids = [post.author_id]
+        if post.author.followers_count < settings.FEED_FANOUT_MAX_FOLLOWERS:
+            recipient_ids += list(
+                Follow.objects.filter(following_id=post.author_id).values_list('follower_id', flat=True)
+            )
+        FeedEntry.objects.bulk_create(
+            [FeedEntry(user_id=user_id, post_id=post.id, created_at=post.created_at) for user_id in recipient_ids],
+            ignore_conflicts=True,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0002_alter_post_media_file_alter_post_thumbnail'),
+        ('accounts', '0002_alter_user_cover_photo_alter_user_profile_picture'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField()),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feed_entries', to='posts.post')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feed_entries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['user', '-created_at'], name='feedentry_user_created_idx')],
+                'unique_together': {('user', 'post')},
+            },
+        ),
+        migrations.RunPython(backfill_feeds, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 6.0.2 on 2026-10-17 01:16
+
+import math
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def compute_scores(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    weights = settings.TRENDING_WEIGHTS
+    batch = []
+    for post in Post.objects.order_by('id').iterator():
+        engagement = (
+            post.likes_count * weights['likes']
+            + post.comments_count * weights['comments']
+            + post.shares_count * weights['shares']
+            + post.views_count * weights['views']
+        )
+        post.trending_score = (
+            math.log2(1 + engagement) + post.created_at.timestamp() / settings.TRENDING_HALF_LIFE_SECONDS
+        )
+        batch.append(post)
+        if len(batch) >= 1000:
+            Post.objects.bulk_update(batch, ['trending_score'])
+            batch = []
+    Post.objects.bulk_update(batch, ['trending_score'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0003_feedentry'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='trending_score',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['is_exclusive', '-trending_score'], name='post_trending_idx'),
+        ),
+        migrations.RunPython(compute_scores, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,7 @@
+import math
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 from cloudinary.models import CloudinaryField
 
 class Post(models.Model):
@@ -22,16 +24,59 @@ class Post(models.Model):
     comments_count = models.IntegerField(default=0)
     views_count = models.IntegerField(default=0)
     shares_count = models.IntegerField(default=0)
+    trending_score = models.FloatField(default=0)
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-trending_score'], condition=models.Q(is_exclusive=False),
+                         name='post_public_trending_idx'),
+            models.Index(fields=['author', '-created_at', '-id'], name='post_author_created_idx'),
+            models.Index(fields=['-likes_count'], condition=models.Q(is_exclusive=False),
+                         name='post_public_likes_idx'),
+        ]
     
     def __str__(self):
         return f"{self.author.username}'s {self.post_type} post"
 
+    def compute_trending_score(self):
+        """
+        Time-decayed popularity score.
+
+        Doubling a post's weighted engagement is worth the same as being one
+        half-life newer, so scores never need to decay in place: the ranking
+        stays correct as time passes and only changes when engagement does.
+        """
+        weights = settings.TRENDING_WEIGHTS
+        engagement = (
+            self.likes_count * weights['likes']
+            + self.comments_count * weights['comments']
+            + self.shares_count * weights['shares']
+            + self.views_count * weights['views']
+        )
+        created_at = self.created_at or timezone.now()
+        return math.log2(1 + engagement) + created_at.timestamp() / settings.TRENDING_HALF_LIFE_SECONDS
+
+    @classmethod
+    def refresh_trending_scores(cls, post_ids):
+        """Recompute stored scores after counters were changed with update()"""
+        posts = list(cls.objects.filter(pk__in=post_ids).only(
+            'id', 'likes_count', 'comments_count', 'shares_count', 'views_count', 'created_at'
+        ))
+        for post in posts:
+            post.trending_score = post.compute_trending_score()
+        cls.objects.bulk_update(posts, ['trending_score'])
+
+    def save(self, *args, **kwargs):
+        self.trending_score = self.compute_trending_score()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'trending_score' not in update_fields:
+            kwargs['update_fields'] = list(update_fields) + ['trending_score']
+        super().save(*args, **kwargs)
+
 
 class Like(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
@@ -51,6 +96,9 @@ class Comment(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['post', '-created_at'], name='comment_post_created_idx'),
+        ]
 
 
 class PostPurchase(models.Model):
@@ -61,4 +109,29 @@ class PostPurchase(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
-        unique_together = ('user', 'post')
\ No newline at end of file
+        unique_together = ('user', 'post')
+
+
+class PostSearchIndex(models.Model):
+    """Read-only view of the SQLite FTS5 index on Post.content (see migration 0006)"""
+    post = models.OneToOneField(Post, on_delete=models.DO_NOTHING, primary_key=True,
+                                db_column='rowid', related_name='search_index')
+    content = models.TextField()
+
+    class Meta:
+        managed = False
+        db_table = 'posts_post_fts'
+
+
+class FeedEntry(models.Model):
+    """Materialized home feed: one row per post delivered to a user's inbox"""
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='feed_entries')
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='feed_entries')
+    created_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = ('user', 'post')
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at', '-post'], name='feedentry_user_created_idx'),
+        ]
@@ -0,0 +1,53 @@
+import re
+
+from django.db import connection
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+from .models import Post, PostPurchase
+
+# Postgres keeps a generated tsvector column with a GIN index; SQLite keeps
+# an FTS5 table synced by triggers. Both are created in migration 0006.
+POSTGRES_MATCH = "posts_post.search_vector @@ plainto_tsquery('english', %s)"
+POSTGRES_RANK = "ts_rank(posts_post.search_vector, plainto_tsquery('english', %s))::float8"
+SQLITE_MATCH = 'posts_post_fts.content MATCH %s'
+SQLITE_RANK = '-bm25(posts_post_fts)'
+
+
+def _fts5_query(terms):
+    # Quote every term so user input can't use FTS5 query syntax
+    return ' '.join(f'"{term}"' for term in terms)
+
+
+def search_posts(query, user):
+    """
+    Posts whose content matches ``query``, annotated with a ``rank``
+    (higher is better). Exclusive posts are only returned to their author
+    and to users who bought them.
+    """
+    terms = re.findall(r'\w+', query)
+    if not terms:
+        return Post.objects.none()
+
+    posts = Post.objects.all()
+    if connection.vendor == 'postgresql':
+        params = [' '.join(terms)]
+        match = RawSQL(POSTGRES_MATCH, params, output_field=BooleanField())
+        rank = RawSQL(POSTGRES_RANK, params, output_field=FloatField())
+    elif connection.vendor == 'sqlite':
+        # Join the FTS table (through PostSearchIndex) so bm25() is computed
+        # in the same scan as the match
+        posts = posts.filter(search_index__isnull=False)
+        match = RawSQL(SQLITE_MATCH, [_fts5_query(terms)], output_field=BooleanField())
+        rank = RawSQL(SQLITE_RANK, [], output_field=FloatField())
+    else:
+        match = Q()
+        for term in terms:
+            match &= Q(content__icontains=term)
+        rank = Value(0.0, output_field=FloatField())
+
+    visible = Q(is_exclusive=False)
+    if user.is_authenticated:
+        visible |= Q(author=user) | Q(id__in=PostPurchase.objects.filter(user=user).values('post_id'))
+
+    return posts.filter(match).filter(visible).annotate(rank=rank).select_related('author')
@@ -1,9 +1,25 @@
 from rest_framework import serializers
 from .models import Post, Like, Comment, PostPurchase
-from accounts.serializers import UserSerializer
+from .view_counter import view_counts
+from accounts.serializers import UserSerializer, UserSummarySerializer
+from counters import shards
+from rocials_backend.media import media_url
+from rocials_backend.sparse_fields import SparseFieldsetMixin
 
-class PostSerializer(serializers.ModelSerializer):
-    author = UserSerializer(read_only=True)
+SHARDED_COUNTERS = ('likes_count', 'comments_count', 'shares_count')
+
+
+class PostListSerializer(serializers.ListSerializer):
+    """Resolves viewer likes/purchases and counter deltas for a whole page at once"""
+
+    def to_representation(self, data):
+        posts = list(data.all() if hasattr(data, 'all') else data)
+        self.child.load_page_state(posts)
+        return super().to_representation(posts)
+
+
+class PostSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    author = UserSummarySerializer(read_only=True)
     is_liked = serializers.SerializerMethodField()
     is_purchased = serializers.SerializerMethodField()
     can_view = serializers.SerializerMethodField()
@@ -18,27 +34,57 @@ class PostSerializer(serializers.ModelSerializer):
                   'shares_count', 'created_at', 'is_liked', 'is_purchased', 'can_view']
         read_only_fields = ['id', 'author', 'likes_count', 'comments_count',
                             'views_count', 'shares_count', 'created_at']
+        list_serializer_class = PostListSerializer
+
+    expandable_fields = {'author': UserSerializer}
+
+    # Loaded once per page: post IDs the viewer has liked / purchased and
+    # unfolded sharded counter deltas
+    liked_ids = None
+    purchased_ids = None
+    counter_deltas = None
+
+    def load_page_state(self, posts):
+        post_ids = [post.id for post in posts]
+        self.counter_deltas = shards.pending(Post, post_ids)
+        self.liked_ids = set()
+        self.purchased_ids = set()
+        request = self.context.get('request')
+        if request and request.user.is_authenticated:
+            self.liked_ids = set(
+                Like.objects.filter(user=request.user, post_id__in=post_ids).values_list('post_id', flat=True)
+            )
+            self.purchased_ids = set(
+                PostPurchase.objects.filter(user=request.user, post_id__in=post_ids).values_list('post_id', flat=True)
+            )
+
+    def to_representation(self, instance):
+        if self.liked_ids is None:
+            self.load_page_state([instance])
+        data = super().to_representation(instance)
+        for field in SHARDED_COUNTERS:
+            if field in data:
+                data[field] += self.counter_deltas.get((instance.id, field), 0)
+        if 'views_count' in data:
+            data['views_count'] += view_counts.pending(instance.id)
+        return data
 
     def get_media_url(self, obj):
-        if obj.media_file:
-            return obj.media_file.url  # Cloudinary returns the full URL
-        return None
+        return media_url(obj.media_file)
 
     def get_thumbnail_url(self, obj):
-        if obj.thumbnail:
-            return obj.thumbnail.url  # Cloudinary returns the full URL
-        return None
+        return media_url(obj.thumbnail)
 
     def get_is_liked(self, obj):
         request = self.context.get('request')
         if request and request.user.is_authenticated:
-            return Like.objects.filter(user=request.user, post=obj).exists()
+            return obj.id in self.liked_ids
         return False
 
     def get_is_purchased(self, obj):
         request = self.context.get('request')
         if request and request.user.is_authenticated:
-            return PostPurchase.objects.filter(user=request.user, post=obj).exists()
+            return obj.id in self.purchased_ids
         return False
 
     def get_can_view(self, obj):
@@ -46,16 +92,18 @@ class PostSerializer(serializers.ModelSerializer):
         if not obj.is_exclusive:
             return True
         if request and request.user.is_authenticated:
-            if obj.author == request.user:
+            if obj.author_id == request.user.id:
                 return True
             return self.get_is_purchased(obj)
         return False
 
 
-class CommentSerializer(serializers.ModelSerializer):
-    user = UserSerializer(read_only=True)
+class CommentSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    user = UserSummarySerializer(read_only=True)
 
     class Meta:
         model = Comment
         fields = ['id', 'user', 'content', 'created_at', 'updated_at']
-        read_only_fields = ['id', 'user', 'created_at', 'updated_at']
\ No newline at end of file
+        read_only_fields = ['id', 'user', 'created_at', 'updated_at']
+
+    expandable_fields = {'user': UserSerializer}
\ No newline at end of file
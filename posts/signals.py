@@ -0,0 +1,31 @@
+from django.contrib.auth import get_user_model
+from django.db.models import F
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from counters import shards
+from rocials_backend.response_cache import invalidate
+from .models import Post
+
+User = get_user_model()
+
+
+@receiver([post_save, post_delete], sender=Post)
+def invalidate_post_responses(sender, instance, **kwargs):
+    invalidate('posts', f'user_posts:{instance.author.username}', f'user:{instance.author.username}')
+
+
+@receiver(post_save, sender=Post)
+def increment_posts_count(sender, instance, created, **kwargs):
+    if created:
+        User.objects.filter(pk=instance.author_id).update(posts_count=F('posts_count') + 1)
+
+
+@receiver(post_delete, sender=Post)
+def decrement_posts_count(sender, instance, **kwargs):
+    User.objects.filter(pk=instance.author_id).update(posts_count=F('posts_count') - 1)
+
+
+@receiver(post_delete, sender=Post)
+def discard_counter_shards(sender, instance, **kwargs):
+    shards.discard(instance)
@@ -1,3 +1,154 @@
-from django.test import TestCase
+from cloudinary import CloudinaryResource
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from accounts.models import Follow
+from rocials_backend.media import _cloudinary_url, media_url
+from rocials_backend.query_plans import QueryPlanAssertions
+from .explore import refresh_pool
+from .feed import fan_out_post
+from .models import Post, Comment, FeedEntry
+
+User = get_user_model()
+
+POST_TABLES = ['posts_post', 'posts_feedentry', 'posts_comment', 'posts_like', 'posts_postpurchase']
+
+
+class PostQueryPlanTests(QueryPlanAssertions, TestCase):
+    """Hot post queries must be index reads, not full table scans"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.alice = User.objects.create_user('alice', 'alice@example.com', 'password123')
+        cls.bob = User.objects.create_user('bob', 'bob@example.com', 'password123')
+        Follow.objects.create(follower=cls.alice, following=cls.bob)
+        for i in range(30):
+            author = cls.bob if i % 2 else cls.alice
+            post = Post.objects.create(author=author, post_type='text', content=f'post {i}',
+                                       is_exclusive=i % 5 == 0, likes_count=i)
+            fan_out_post(post)
+            Comment.objects.create(user=cls.alice, post=post, content=f'comment {i}')
+        cls.post = post
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.alice)
+
+    def test_home_feed(self):
+        self.assertNoFullScans(lambda: self.client.get('/api/posts/'), POST_TABLES)
+
+    def test_user_posts(self):
+        self.assertNoFullScans(lambda: self.client.get('/api/posts/user/bob/'), POST_TABLES)
+
+    def test_comments(self):
+        self.assertNoFullScans(lambda: self.client.get(f'/api/posts/{self.post.id}/comments/'), POST_TABLES)
+
+    def test_trending(self):
+        self.assertNoFullScans(lambda: self.client.get('/api/posts/trending/'), POST_TABLES)
+
+    def test_explore_pool(self):
+        self.assertNoFullScans(refresh_pool, POST_TABLES)
+
+
+class HomeFeedTests(TestCase):
+    """Fan-out on write, follow backfill/prune and the celebrity merge"""
+
+    def setUp(self):
+        cache.clear()
+        self.alice = User.objects.create_user('alice', 'alice@example.com', 'password123')
+        self.bob = User.objects.create_user('bob', 'bob@example.com', 'password123')
+        self.client = APIClient()
+        self.client.force_authenticate(self.bob)
+
+    def post_as(self, author, content):
+        post = Post.objects.create(author=author, post_type='text', content=content)
+        fan_out_post(post)
+        return post
+
+    def feed(self):
+        """Every post ID in bob's feed, following the cursor across pages"""
+        ids, url = [], '/api/posts/'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            ids += [post['id'] for post in response.data['results']]
+            url = response.data['next']
+        return ids
+
+    def test_fan_out_delivers_to_followers(self):
+        Follow.objects.create(follower=self.bob, following=self.alice)
+        post = self.post_as(self.alice, 'hello')
+        self.assertEqual(
+            set(FeedEntry.objects.filter(post=post).values_list('user_id', flat=True)),
+            {self.alice.id, self.bob.id},
+        )
+        self.assertEqual(self.feed(), [post.id])
+
+    def test_follow_backfills_and_unfollow_prunes(self):
+        posts = [self.post_as(self.alice, f'post {i}') for i in range(3)]
+        own = self.post_as(self.bob, 'mine')
+
+        self.client.post('/api/accounts/follow/alice/')
+        self.assertEqual(self.feed(), [own.id] + [post.id for post in reversed(posts)])
+
+        self.client.post('/api/accounts/follow/alice/')
+        self.assertEqual(self.feed(), [own.id])
+
+    @override_settings(FEED_INBOX_SIZE=5)
+    def test_backfill_trims_inbox(self):
+        posts = [self.post_as(self.alice, f'post {i}') for i in range(8)]
+        self.client.post('/api/accounts/follow/alice/')
+        self.assertEqual(self.feed(), [post.id for post in reversed(posts)][:5])
+
+    @override_settings(FEED_FANOUT_MAX_FOLLOWERS=1)
+    def test_celebrity_posts_are_merged_on_read(self):
+        carol = User.objects.create_user('carol', 'carol@example.com', 'password123', followers_count=1)
+        Follow.objects.create(follower=self.bob, following=self.alice)
+        Follow.objects.create(follower=self.bob, following=carol)
+
+        expected = []
+        for i in range(45):
+            post = self.post_as(carol if i % 3 else self.alice, f'post {i}')
+            expected.append(post.id)
+        self.assertFalse(FeedEntry.objects.filter(user=self.bob, post__author=carol).exists())
+
+        # Pages of 20 interleave both sources without gaps or repeats
+        self.assertEqual(self.feed(), list(reversed(expected)))
+
+    def test_browsable_api(self):
+        post = self.post_as(self.bob, 'mine')
+        response = self.client.get('/api/posts/', HTTP_ACCEPT='text/html')
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, f'&quot;id&quot;: {post.id}')
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self.client.get('/api/posts/?cursor=bogus').status_code, 404)
+
+
+class MediaUrlTests(SimpleTestCase):
+    """media_url must build the same URLs as CloudinaryResource.url"""
+
+    def resource(self, **url_options):
+        return CloudinaryResource('posts/media_1', format='jpg', version=1700000000,
+                                  resource_type='image', url_options={'cloud_name': 'demo', **url_options})
+
+    def test_matches_sdk(self):
+        for url_options in ({}, {'format': 'webp', 'type': 'private'}, {'width': 200, 'crop': 'fill'}):
+            resource = self.resource(**url_options)
+            self.assertEqual(media_url(resource), resource.url)
+
+    def test_repeated_urls_are_cached(self):
+        resource = self.resource(format='webp', type='private', width=320)
+        media_url(resource)
+        hits = _cloudinary_url.cache_info().hits
+        media_url(resource)
+        self.assertEqual(_cloudinary_url.cache_info().hits, hits + 1)
+
+    def test_unhashable_options_are_built_uncached(self):
+        resource = self.resource(transformation=[{'width': 100, 'crop': 'scale'}])
+        calls = _cloudinary_url.cache_info().misses + _cloudinary_url.cache_info().hits
+        self.assertEqual(media_url(resource), resource.url)
+        self.assertEqual(_cloudinary_url.cache_info().misses + _cloudinary_url.cache_info().hits, calls)
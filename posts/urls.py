@@ -9,6 +9,7 @@ urlpatterns = [
     path('<int:pk>/', views.PostDetailView.as_view(), name='post-detail'),
     path('trending/', views.TrendingPostsView.as_view(), name='trending-posts'),
     path('explore/', views.explore_posts, name='explore-posts'),
+    path('search/', views.PostSearchView.as_view(), name='post-search'),
     path('user/<str:username>/', views.UserPostsView.as_view(), name='user-posts'),
 
     # -------------------------
@@ -0,0 +1,71 @@
+import atexit
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import F
+
+from .models import Post
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCountBuffer:
+    """
+    Write-behind accumulator for Post.views_count.
+
+    Views are counted in memory and applied to the database in batched
+    ``F()`` updates by a background thread every ``interval`` seconds, so
+    reading a post no longer writes its row.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._pending = Counter()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def record(self, post_id, count=1):
+        with self._lock:
+            self._pending[post_id] += count
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='view-count-flusher', daemon=True)
+                self._thread.start()
+
+    def pending(self, post_id):
+        """Views recorded for a post that haven't been flushed yet"""
+        return self._pending.get(post_id, 0)
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+        if not pending:
+            return 0
+
+        try:
+            # One UPDATE per distinct delta rather than one per post
+            by_delta = defaultdict(list)
+            for post_id, delta in pending.items():
+                by_delta[delta].append(post_id)
+            for delta, post_ids in by_delta.items():
+                Post.objects.filter(pk__in=post_ids).update(views_count=F('views_count') + delta)
+            Post.refresh_trending_scores(list(pending))
+        except Exception:
+            logger.exception('Failed to flush view counts; retrying next interval')
+            with self._lock:
+                self._pending.update(pending)
+            return 0
+        return len(pending)
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            close_old_connections()
+            self.flush()
+
+
+view_counts = ViewCountBuffer(settings.VIEW_COUNT_FLUSH_INTERVAL)
+atexit.register(view_counts.flush)
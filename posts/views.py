@@ -2,13 +2,21 @@ from rest_framework import generics, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
-from django.db.models import Q
 from datetime import timedelta
 from django.utils import timezone
 from django.shortcuts import get_object_or_404
+from django.db import transaction
 from .models import Post, Like, Comment, PostPurchase
 from .serializers import PostSerializer, CommentSerializer
+from .feed import HomeFeedPagination, fan_out_post
+from .explore import sample_page, default_seed
+from .view_counter import view_counts
+from .search import search_posts
 from notifications.models import Notification
+from counters import shards
+from rocials_backend.pagination import CreatedAtCursorPagination, RankCursorPagination
+from rocials_backend.response_cache import cached_response, invalidate
+from django.utils.decorators import method_decorator
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
 import cloudinary
@@ -21,16 +29,24 @@ import cloudinary.utils
 class PostListCreateView(generics.ListCreateAPIView):
     serializer_class = PostSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = HomeFeedPagination
 
     def get_queryset(self):
-        user = self.request.user
-        following_users = user.following.values_list('following', flat=True)
-        return Post.objects.filter(
-            Q(author=user) | Q(author__in=following_users)
-        ).select_related('author').order_by('-created_at')
+        # Pages are assembled by home_feed_page(); this only serves the
+        # browsable API's introspection
+        return Post.objects.none()
+
+    def list(self, request, *args, **kwargs):
+        posts = self.paginator.paginate_feed(request)
+        serializer = self.get_serializer(posts, many=True)
+        return self.get_paginated_response(serializer.data)
 
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user)
+        # The author's posts_count is bumped by a post_save signal; commit
+        # it together with the post
+        with transaction.atomic():
+            post = serializer.save(author=self.request.user)
+        fan_out_post(post)
 
 
 class PostDetailView(generics.RetrieveUpdateDestroyAPIView):
@@ -40,8 +56,7 @@ class PostDetailView(generics.RetrieveUpdateDestroyAPIView):
 
     def retrieve(self, request, *args, **kwargs):
         post = self.get_object()
-        post.views_count += 1
-        post.save()
+        view_counts.record(post.id)
         serializer = self.get_serializer(post)
         return Response(serializer.data)
 
@@ -57,7 +72,12 @@ class PostDetailView(generics.RetrieveUpdateDestroyAPIView):
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         return super().destroy(request, *args, **kwargs)
 
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            instance.delete()
 
+
+@method_decorator(cached_response('posts'), name='list')
 class TrendingPostsView(generics.ListAPIView):
     serializer_class = PostSerializer
     permission_classes = [AllowAny]
@@ -67,35 +87,49 @@ class TrendingPostsView(generics.ListAPIView):
         return Post.objects.filter(
             created_at__gte=week_ago,
             is_exclusive=False
-        ).order_by('-likes_count', '-views_count')[:20]
+        ).select_related('author').order_by('-trending_score')[:20]
 
 
+@method_decorator(cached_response('user_posts:{username}'), name='list')
 class UserPostsView(generics.ListAPIView):
     serializer_class = PostSerializer
     permission_classes = [AllowAny]
+    pagination_class = CreatedAtCursorPagination
 
     def get_queryset(self):
         username = self.kwargs['username']
-        return Post.objects.filter(author__username=username).order_by('-created_at')
+        return Post.objects.filter(author__username=username).select_related('author').order_by('-created_at')
+
+
+class PostSearchView(generics.ListAPIView):
+    """Full-text search over post content, best matches first"""
+    serializer_class = PostSerializer
+    permission_classes = [AllowAny]
+    pagination_class = RankCursorPagination
+
+    def get_queryset(self):
+        return search_posts(self.request.GET.get('q', ''), self.request.user)
 
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def like_post(request, pk):
     try:
-        post = Post.objects.get(pk=pk)
+        post = Post.objects.select_related('author').get(pk=pk)
     except Post.DoesNotExist:
         return Response({'error': 'Post not found'}, status=status.HTTP_404_NOT_FOUND)
 
     like, created = Like.objects.get_or_create(user=request.user, post=post)
+    # Only the author's post list is refreshed after the write; trending
+    # and explore pick up like counts when their entries go stale
     if not created:
         like.delete()
-        post.likes_count -= 1
-        post.save()
+        shards.increment(post, 'likes_count', -1)
+        invalidate(f'user_posts:{post.author.username}')
         return Response({'message': 'Unliked', 'is_liked': False})
     else:
-        post.likes_count += 1
-        post.save()
+        shards.increment(post, 'likes_count')
+        invalidate(f'user_posts:{post.author.username}')
         if post.author != request.user:
             notification = Notification.objects.create(
                 recipient=post.author,
@@ -115,9 +149,8 @@ def like_post(request, pk):
 def share_post(request, pk):
     try:
         post = Post.objects.get(pk=pk)
-        post.shares_count += 1
-        post.save()
-        return Response({'message': 'Post shared', 'shares_count': post.shares_count})
+        shards.increment(post, 'shares_count')
+        return Response({'message': 'Post shared', 'shares_count': shards.get_count(post, 'shares_count')})
     except Post.DoesNotExist:
         return Response({'error': 'Post not found'}, status=status.HTTP_404_NOT_FOUND)
 
@@ -128,6 +161,7 @@ def share_post(request, pk):
 class CommentListCreateView(generics.ListCreateAPIView):
     serializer_class = CommentSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = CreatedAtCursorPagination
 
     def get_queryset(self):
         post_id = self.kwargs['post_id']
@@ -142,8 +176,7 @@ class CommentListCreateView(generics.ListCreateAPIView):
             return Response({'error': 'Content required'}, status=status.HTTP_400_BAD_REQUEST)
 
         comment = Comment.objects.create(user=request.user, post=post, content=content)
-        post.comments_count += 1
-        post.save()
+        shards.increment(post, 'comments_count')
 
         if post.author != request.user:
             notification = Notification.objects.create(
@@ -167,8 +200,23 @@ class CommentListCreateView(generics.ListCreateAPIView):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@cached_response('posts')
 def explore_posts(request):
-    posts = Post.objects.filter(is_exclusive=False).order_by('-likes_count', '?')[:30]
+    """
+    Random sample of popular posts drawn from the precomputed explore pool.
+
+    Pass the same ``seed`` with increasing ``page`` numbers to scroll through
+    one shuffle without duplicates.
+    """
+    seed = request.GET.get('seed') or default_seed(request.user)
+    try:
+        page = max(1, int(request.GET.get('page', 1)))
+    except ValueError:
+        page = 1
+
+    post_ids = sample_page(seed, page)
+    posts_by_id = Post.objects.filter(is_exclusive=False).select_related('author').in_bulk(post_ids)
+    posts = [posts_by_id[post_id] for post_id in post_ids if post_id in posts_by_id]
     serializer = PostSerializer(posts, many=True, context={'request': request})
     return Response(serializer.data)
 
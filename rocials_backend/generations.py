@@ -0,0 +1,25 @@
+import time
+
+from django.core.cache import cache
+
+
+def current(*keys):
+    """
+    Current value of each generation key in the cache.
+
+    A missing key (never set, or evicted) starts from a new unique value
+    rather than a default, so entries cached under an earlier generation
+    can never come back.
+    """
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            generation = time.time_ns()
+            cache.add(key, generation, None)
+            generations[key] = cache.get(key, generation)
+    return [generations[key] for key in keys]
+
+
+def bump(*keys):
+    """Move each generation key to a new value, retiring everything cached under the old one"""
+    cache.set_many({key: time.time_ns() for key in keys}, None)
@@ -0,0 +1,40 @@
+from functools import lru_cache
+
+import cloudinary.utils
+from django.conf import settings
+
+
+@lru_cache(maxsize=settings.MEDIA_URL_CACHE_SIZE)
+def _cloudinary_url(public_id, options):
+    return cloudinary.utils.cloudinary_url(public_id, **dict(options))[0]
+
+
+def media_url(resource, **options):
+    """
+    Memoized equivalent of ``resource.url`` for a CloudinaryField value.
+
+    URLs are a pure function of the public ID, resource type and
+    transformation, so they are cached in a bounded per-process LRU and
+    shared across requests.
+    """
+    if not resource:
+        return None
+    if not hasattr(resource, 'public_id'):
+        return resource.url
+
+    # Same precedence as CloudinaryResource.build_url
+    options = {
+        'format': resource.format,
+        'version': resource.version,
+        'type': resource.type,
+        'resource_type': resource.resource_type or 'image',
+        **resource.url_options,
+        **options,
+    }
+    key = tuple(sorted(options.items()))
+    try:
+        hash(key)
+    except TypeError:
+        # Unhashable transformation options (e.g. nested dicts)
+        return resource.build_url(**options)
+    return _cloudinary_url(resource.public_id, key)
@@ -0,0 +1,18 @@
+from rest_framework.pagination import CursorPagination
+
+
+class CreatedAtCursorPagination(CursorPagination):
+    """
+    Keyset pagination over (created_at, id) for time-ordered lists.
+
+    Pages are addressed by an opaque cursor instead of a page number, so
+    deep scrolls don't pay for OFFSET and no COUNT query is issued.
+    """
+    page_size = 20
+    ordering = ('-created_at', '-id')
+
+
+class RankCursorPagination(CursorPagination):
+    """Cursor pagination for search results annotated with a ``rank``"""
+    page_size = 20
+    ordering = ('-rank', '-id')
@@ -0,0 +1,64 @@
+import json
+import re
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def _sqlite_full_scans(cursor, sql):
+    aliases = dict((alias, table) for table, alias in re.findall(r'"(\w+)" (U\d+)', sql))
+    cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+    scans = []
+    for *_, detail in cursor.fetchall():
+        # "SCAN posts_post" is a full scan; "SCAN ... USING INDEX" and
+        # "SEARCH ..." are index reads
+        match = re.fullmatch(r'SCAN (?:TABLE )?(\w+)', detail)
+        if match:
+            scans.append(aliases.get(match.group(1), match.group(1)))
+    return scans
+
+
+def _postgres_full_scans(cursor, sql):
+    # Tiny test tables make a seq scan the cheapest plan; disabling it shows
+    # whether an index is available at all
+    cursor.execute('SET LOCAL enable_seqscan = off')
+    cursor.execute('EXPLAIN (FORMAT JSON) ' + sql)
+    plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    scans, nodes = [], [plan[0]['Plan']]
+    while nodes:
+        node = nodes.pop()
+        if node['Node Type'] == 'Seq Scan':
+            scans.append(node['Relation Name'])
+        nodes.extend(node.get('Plans', []))
+    return scans
+
+
+def full_scans(sql):
+    """Tables the database would read in full to run ``sql``"""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            return _sqlite_full_scans(cursor, sql)
+        if connection.vendor == 'postgresql':
+            return _postgres_full_scans(cursor, sql)
+    raise NotImplementedError(f'No query plan support for {connection.vendor}')
+
+
+class QueryPlanAssertions:
+    """TestCase mixin asserting that hot queries are served from indexes"""
+
+    def assertNoFullScans(self, func, tables):
+        """Run ``func`` and EXPLAIN each SELECT it issued against ``tables``"""
+        if connection.vendor not in ('sqlite', 'postgresql'):
+            self.skipTest(f'No query plan support for {connection.vendor}')
+
+        with CaptureQueriesContext(connection) as context:
+            func()
+
+        selects = [q['sql'] for q in context.captured_queries if q['sql'].lstrip().upper().startswith('SELECT')]
+        self.assertTrue(selects, 'No SELECT queries were captured')
+        for sql in selects:
+            scanned = set(full_scans(sql)) & set(tables)
+            self.assertFalse(scanned, f'Full scan of {sorted(scanned)} in: {sql}')
@@ -0,0 +1,74 @@
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.response import Response
+
+from . import generations
+
+
+def _version_key(namespace):
+    return f'rc:ver:{namespace}'
+
+
+def invalidate(*namespaces):
+    """
+    Drop every cached response that depends on any of ``namespaces``, once
+    the current transaction commits. A request rebuilding before then
+    would read the old rows and cache them under the new versions.
+    """
+    transaction.on_commit(lambda: generations.bump(*[_version_key(ns) for ns in namespaces]))
+
+
+def _versions(namespaces):
+    return [str(version) for version in generations.current(*[_version_key(ns) for ns in namespaces])]
+
+
+def viewer_class(request):
+    return 'auth' if request.user.is_authenticated else 'anon'
+
+
+def cached_response(*namespaces, authenticated=False):
+    """
+    Cache a GET view's response data in Django's cache framework.
+
+    Entries are keyed by path, query string and viewer class, and tagged
+    with ``namespaces`` (formatted with the view's URL kwargs, e.g.
+    ``'user:{username}'``) so writes can invalidate them precisely. The
+    namespace versions are stored in the entry rather than its key, so
+    once an entry goes stale or is invalidated, one request rebuilds it
+    while the others keep getting the old copy. Authenticated viewers
+    bypass the cache unless ``authenticated`` is set, since responses
+    usually embed viewer state such as ``is_liked``.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            viewer = viewer_class(request)
+            if request.method != 'GET' or (viewer == 'auth' and not authenticated):
+                return view(request, *args, **kwargs)
+
+            versions = _versions([ns.format(**kwargs) for ns in namespaces])
+            raw_key = f'{request.get_full_path()}|{viewer}'
+            key = 'rc:' + hashlib.md5(raw_key.encode()).hexdigest()
+
+            entry = cache.get(key)
+            if entry is not None:
+                data, fresh_until, entry_versions = entry
+                current = entry_versions == versions and time.time() < fresh_until
+                if current or not cache.add(f'{key}:lock', 1, 30):
+                    return Response(data)
+
+            response = view(request, *args, **kwargs)
+            if response.status_code == 200:
+                # Versions read before the rebuild, so a write during it
+                # still leaves this entry out of date
+                fresh = settings.RESPONSE_CACHE_FRESH
+                cache.set(key, (response.data, time.time() + fresh, versions), fresh + settings.RESPONSE_CACHE_STALE)
+                cache.delete(f'{key}:lock')
+            return response
+        return wrapper
+    return decorator
@@ -52,6 +52,7 @@ INSTALLED_APPS = [
     'messaging',
     'notifications',
     'payments',
+    'counters',
 ]
 
 # -------------------------
@@ -121,6 +122,34 @@ else:
         }
     }
 
+# -------------------------
+# Cache
+# -------------------------
+# Invalidations of cached responses, the follow graph, authenticated users
+# and revoked tokens only reach other workers through a shared cache. The
+# LocMemCache fallback is per process, so run more than one worker only
+# with REDIS_URL set (RedisCache needs the redis package).
+REDIS_URL = os.getenv('REDIS_URL', '')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Public read endpoints: seconds a cached response is fresh, then how long
+# it may still be served while one request rebuilds it
+RESPONSE_CACHE_FRESH = 30
+RESPONSE_CACHE_STALE = 5 * 60
+
 # -------------------------
 # Password validation
 # -------------------------
@@ -167,6 +196,9 @@ CLOUDINARY_STORAGE = {
 DEFAULT_FILE_STORAGE = 'cloudinary_storage.storage.MediaCloudinaryStorage'
 MEDIA_URL = '/media/'
 
+# Built Cloudinary URLs kept per process (see rocials_backend.media)
+MEDIA_URL_CACHE_SIZE = 10000
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # -------------------------
@@ -179,7 +211,7 @@ AUTH_USER_MODEL = 'accounts.User'
 # -------------------------
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.AllowAny',
@@ -188,6 +220,90 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 20,
 }
 
+# -------------------------
+# Home feed
+# -------------------------
+# Authors with at least this many followers are not fanned out on write;
+# their posts are merged into followers' feeds at read time instead.
+FEED_FANOUT_MAX_FOLLOWERS = int(os.getenv('FEED_FANOUT_MAX_FOLLOWERS', 10000))
+FEED_FANOUT_BATCH_SIZE = 1000
+FEED_BACKFILL_LIMIT = 100
+# Inboxes keep only their newest entries (trimmed after a follow backfill
+# and by the trim_feeds command)
+FEED_INBOX_SIZE = 1000
+# How long the set of above-threshold authors is cached for feed reads
+FEED_CELEBRITIES_CACHE_TIMEOUT = 60
+
+# -------------------------
+# Trending
+# -------------------------
+# Engagement weights and half-life for Post.trending_score
+TRENDING_WEIGHTS = {'likes': 1.0, 'comments': 2.0, 'shares': 3.0, 'views': 0.1}
+TRENDING_HALF_LIFE_SECONDS = 12 * 60 * 60
+
+# -------------------------
+# Explore
+# -------------------------
+# Size and lifetime of the cached pool that explore_posts samples from
+EXPLORE_POOL_SIZE = 1000
+EXPLORE_POOL_TTL = 5 * 60
+
+# -------------------------
+# View counting
+# -------------------------
+# Post views are buffered in memory and written in batches this often
+VIEW_COUNT_FLUSH_INTERVAL = 10
+
+# -------------------------
+# Sharded counters
+# -------------------------
+# Slots per hot counter (likes, comments, shares, followers, following)
+COUNTER_SHARDS = 16
+# Objects folded per transaction by fold_counters
+COUNTER_FOLD_BATCH_SIZE = 100
+
+# -------------------------
+# User search
+# -------------------------
+# Shorter queries only match prefixes, from the autocomplete index; longer
+# ones rank at most this many database matches
+SEARCH_MIN_QUERY_LENGTH = 3
+SEARCH_MAX_CANDIDATES = 500
+
+# -------------------------
+# Username autocomplete
+# -------------------------
+# In-memory index size cap (most-followed users win; ~400 bytes per user)
+# and full reload period
+AUTOCOMPLETE_MAX_USERS = 250_000
+AUTOCOMPLETE_REFRESH_SECONDS = 10 * 60
+
+# -------------------------
+# Follow graph
+# -------------------------
+# Lifetime of each user's cached following set. Follows retire it, but
+# only in this process unless the cache is shared
+FOLLOW_GRAPH_CACHE_TIMEOUT = 60
+# Rows fetched per round trip by ?export=ndjson follower/following exports
+FOLLOW_EXPORT_CHUNK_SIZE = 2000
+
+# -------------------------
+# Suggestions
+# -------------------------
+# Candidates kept per user by compute_suggestions, and users scored per batch
+SUGGESTIONS_PER_USER = 50
+SUGGESTIONS_BATCH_SIZE = 1000
+
+# -------------------------
+# Authenticated user cache
+# -------------------------
+# Users resolved from JWTs are kept per worker (bounded LRU, short TTL) and,
+# when the cache is shared (REDIS_URL), in it too without the password hash;
+# user saves invalidate both tiers
+AUTH_USER_CACHE_SIZE = 10_000
+AUTH_USER_CACHE_TTL = 5
+AUTH_USER_SHARED_CACHE_TTL = 5 * 60
+
 # -------------------------
 # JWT
 # -------------------------
@@ -197,8 +313,15 @@ SIMPLE_JWT = {
     'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': False,
     'AUTH_HEADER_TYPES': ('Bearer',),
+    'TOKEN_REFRESH_SERIALIZER': 'accounts.serializers.CachedTokenRefreshSerializer',
 }
 
+# Revoked refresh tokens are kept in memory and re-synced from the
+# blacklist table this often; each sync re-reads the rows added over the
+# overlap, in case they committed out of ID order
+REVOCATION_SYNC_SECONDS = 60
+REVOCATION_SYNC_OVERLAP = 5 * 60
+
 # -------------------------
 # CORS SETTINGS
 # -------------------------
@@ -231,6 +354,11 @@ CHANNEL_LAYERS = {
     },
 }
 
+# Chat messages are saved in batches of up to this many, or after this many
+# seconds, whichever comes first
+CHAT_WRITE_BUFFER_SIZE = 100
+CHAT_WRITE_BUFFER_DELAY = 0.005
+
 # -------------------------
 # Stripe
 # -------------------------
@@ -0,0 +1,40 @@
+from rest_framework.serializers import ListSerializer
+
+
+def _param_list(params, name):
+    return {value.strip() for value in params.get(name, '').split(',') if value.strip()}
+
+
+class SparseFieldsetMixin:
+    """
+    Lets clients trim and expand a serializer's output on GET requests.
+
+    ``?fields=id,content`` keeps only the listed fields and ``?expand=author``
+    swaps a compact embedded serializer for the full one named in
+    ``expandable_fields``. Only the top-level resource reads these
+    parameters; nested serializers keep their default shape.
+    """
+    expandable_fields = {}
+
+    def _is_top_level(self):
+        parent = self.parent
+        if isinstance(parent, ListSerializer):
+            parent = parent.parent
+        return parent is None
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        if request is None or request.method != 'GET' or not self._is_top_level():
+            return fields
+
+        params = getattr(request, 'query_params', request.GET)
+        for name in _param_list(params, 'expand'):
+            if name in self.expandable_fields and name in fields:
+                many = isinstance(fields[name], ListSerializer)
+                fields[name] = self.expandable_fields[name](many=many, read_only=True)
+
+        requested = _param_list(params, 'fields')
+        if requested:
+            fields = {name: field for name, field in fields.items() if name in requested}
+        return fields